@@ -1,15 +1,136 @@
 """AI Agent for document exploration and question answering"""
 
 import json
-import yaml
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterator
 import ollama
 
 from ..tools.file_ops import read_file, grep, list_docs
-from ..tools.map_generator import load_knowledge_map, generate_knowledge_map
-from .prompts import get_agent_system_prompt, get_simple_prompt
+from ..tools.map_generator import read_knowledge_map, generate_knowledge_map
+from .prompts import get_agent_system_prompt_from_bytes, get_simple_prompt
 from ..utils.file_watcher import DocumentWatcher
+from ..utils.language import detect_language
+
+# Keep the last 20 question/answer pairs; older turns fall off automatically
+MAX_HISTORY_MESSAGES = 40
+
+# Markers that switch output color while streaming, and their incomplete prefixes
+_STREAM_MARKERS = ('<think>', '</think>', '-----')
+_PARTIAL_MARKERS = frozenset(m[:i] for m in _STREAM_MARKERS for i in range(1, len(m)))
+_MAX_PARTIAL_MARKER = max(len(m) for m in _STREAM_MARKERS) - 1
+
+# Pre-encoded ANSI sequences for streamed output (written to sys.stdout.buffer)
+_ANSI_RESET = b'\033[0m'
+_ANSI_GRAY = b'\033[90m'  # Inside <think> blocks
+_ANSI_DIM = b'\033[2m'  # Sources section
+_STYLED_MARKERS = {
+    '<think>': b'\033[35m<think>\033[0m',
+    '</think>': b'\033[35m</think>\033[0m',
+    '-----': b'\n\033[2m-----\033[0m\n',
+}
+
+# grep tool input: pattern, file_path - split at the first comma, optional matching quotes
+_GREP_ARGS_RE = re.compile(r'^\s*(["\']?)([^,]*?)\1\s*,\s*(["\']?)(.*?)\3\s*$', re.DOTALL)
+
+# str.translate table removing lone surrogates (U+D800..U+DFFF) before printing
+_SURROGATE_TABLE = dict.fromkeys(range(0xD800, 0xE000))
+
+# Tool-call and answer markers in the model's response
+_ACTION_RE = re.compile(r'^[ \t]*Action:[ \t]*(.+)$', re.MULTILINE)
+_ACTION_INPUT_RE = re.compile(r'^[ \t]*Action Input:[ \t]*(.+)$', re.MULTILINE)
+_FINAL_RE = re.compile(r'Final Answer:(.*?)(?=Final Answer:|\Z)', re.DOTALL)
+
+# Fallback keyword search: candidate words and common words to skip
+_WORD_RE = re.compile(r'\b\w{4,}\b')
+_STOP_WORDS = frozenset({
+    'what', 'when', 'where', 'which', 'who', 'how', 'the', 'this', 'that',
+    'with', 'from', 'for', 'are', 'was', 'were'
+})
+
+# Parallel file reads for the fallback keyword search
+FALLBACK_SEARCH_WORKERS = 8
+
+# Phrases suggesting the AI could not answer (already lowercased)
+_INCOMPLETE_INDICATORS = (
+    "i cannot",
+    "i don't have",
+    "no information",
+    "not found",
+    "unable to",
+    "無法",
+    "找不到",
+    "沒有資訊",
+)
+
+
+@lru_cache(maxsize=256)
+def _answer_looks_incomplete(answer: str) -> bool:
+    """Check answer text for phrases indicating the AI could not answer"""
+    answer_lower = answer.lower()
+    return any(indicator in answer_lower for indicator in _INCOMPLETE_INDICATORS)
+
+
+@lru_cache(maxsize=256)
+def _extract_keywords(question: str) -> tuple:
+    """Extract search keywords (words > 3 chars, excluding common words)"""
+    return tuple(w for w in _WORD_RE.findall(question.lower()) if w not in _STOP_WORDS)
+
+
+def _iter_docs(root: str, exts) -> Iterator[str]:
+    """Yield paths of files under root whose extension is in exts.
+
+    Walks with os.scandir so file type and name checks use the cached
+    directory entries instead of building a Path and calling stat per entry.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in exts and entry.is_file():
+                        yield entry.path
+        except OSError:
+            # Skip directories we can't read
+            continue
+
+
+def _handle_read_file(tool_input: str) -> str:
+    return read_file.invoke(tool_input)
+
+
+def _handle_grep(tool_input: str) -> str:
+    # Parse grep arguments: pattern, file_path (either may be quoted)
+    match = _GREP_ARGS_RE.match(tool_input)
+    if not match:
+        return "Error: grep requires pattern and file_path"
+    return grep.invoke({"pattern": match.group(2), "file_path": match.group(4)})
+
+
+def _handle_list_docs(tool_input: str) -> str:
+    return list_docs.invoke(tool_input if tool_input else ".")
+
+
+# Tool name -> handler taking the raw "Action Input" text
+_TOOL_HANDLERS = {
+    "read_file": _handle_read_file,
+    "grep": _handle_grep,
+    "list_docs": _handle_list_docs,
+}
+
+# Tool name -> progress message ({} is the tool input)
+_TOOL_STATUS = {
+    "read_file": "Reading {}...",
+    "grep": "Searching...",
+    "list_docs": "Listing documents...",
+}
 
 
 class DocumentExplorer:
@@ -34,10 +155,12 @@ class DocumentExplorer:
         self.model = model
         self.temperature = temperature
         self.max_iterations = max_iterations
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=MAX_HISTORY_MESSAGES)
 
         # Initialize components
         self.knowledge_map = None
+        self._knowledge_map_bytes: Optional[bytes] = None  # Raw map YAML the parsed map came from
+        self._system_prompts: Dict[str, str] = {}  # Full prompt per response language
         self.watcher = DocumentWatcher(directory)
 
         # Setup
@@ -46,14 +169,14 @@ class DocumentExplorer:
     def _load_or_create_knowledge_map(self):
         """Load existing knowledge map or create new one"""
         # Try to load existing map
-        self.knowledge_map = load_knowledge_map(str(self.directory))
+        self._load_knowledge_map()
 
         if self.knowledge_map is None:
             # generate_knowledge_map will handle all printing
             result = generate_knowledge_map(str(self.directory))
 
             # Load the newly created map
-            self.knowledge_map = load_knowledge_map(str(self.directory))
+            self._load_knowledge_map()
 
             if self.knowledge_map is None:
                 print("⚠️  Warning: Could not load knowledge map. Operating without map context.")
@@ -65,11 +188,24 @@ class DocumentExplorer:
             user_question: User's question for language detection
         """
         if self.knowledge_map:
-            map_yaml = yaml.dump(self.knowledge_map, allow_unicode=True, sort_keys=False)
-            return get_agent_system_prompt(map_yaml, user_question)
+            # Map only changes on rebuild/reload; only the response language
+            # varies between questions, so each language's prompt is built once
+            lang_key = detect_language(user_question) if user_question else ""
+            prompt = self._system_prompts.get(lang_key)
+            if prompt is None:
+                # The file bytes the map was parsed from, so prompt and map always agree
+                prompt = get_agent_system_prompt_from_bytes(self._knowledge_map_bytes, user_question)
+                self._system_prompts[lang_key] = prompt
+            return prompt
         else:
             return get_simple_prompt()
 
+    def _load_knowledge_map(self):
+        """Load the map and its raw YAML from disk in one read"""
+        self.knowledge_map, self._knowledge_map_bytes = read_knowledge_map(str(self.directory))
+        # Prompts embed the previous map's YAML
+        self._system_prompts.clear()
+
     def _call_tool(self, tool_name: str, tool_input: str, status_callback=None) -> str:
         """Call a tool and return result
 
@@ -78,31 +214,16 @@ class DocumentExplorer:
             tool_input: Input for the tool
             status_callback: Optional callback function for status updates
         """
+        handler = _TOOL_HANDLERS.get(tool_name)
+        if handler is None:
+            return f"Error: Unknown tool {tool_name}"
+
         try:
             # Show tool-specific progress message
             if status_callback:
-                if tool_name == "read_file":
-                    status_callback(f"Reading {tool_input}...")
-                elif tool_name == "grep":
-                    status_callback(f"Searching...")
-                elif tool_name == "list_docs":
-                    status_callback(f"Listing documents...")
-
-            if tool_name == "read_file":
-                return read_file.invoke(tool_input)
-            elif tool_name == "grep":
-                # Parse grep arguments: pattern, file_path
-                parts = tool_input.split(',', 1)
-                if len(parts) == 2:
-                    pattern = parts[0].strip().strip('"').strip("'")
-                    file_path = parts[1].strip().strip('"').strip("'")
-                    return grep.invoke({"pattern": pattern, "file_path": file_path})
-                else:
-                    return "Error: grep requires pattern and file_path"
-            elif tool_name == "list_docs":
-                return list_docs.invoke(tool_input if tool_input else ".")
-            else:
-                return f"Error: Unknown tool {tool_name}"
+                status_callback(_TOOL_STATUS[tool_name].format(tool_input))
+
+            return handler(tool_input)
         except Exception as e:
             return f"Error calling tool {tool_name}: {str(e)}"
 
@@ -121,14 +242,10 @@ class DocumentExplorer:
         system_prompt = self._get_system_prompt(question)
         steps = []
 
-        # Build conversation with system prompt
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question}
-        ]
-
-        # Add conversation history
-        messages = messages[:1] + self.conversation_history + messages[1:]
+        # Build conversation: system prompt, previous turns, then the new question
+        messages = [{"role": "system", "content": system_prompt}]
+        messages.extend(self.conversation_history)
+        messages.append({"role": "user", "content": question})
 
         try:
             # Simple iterative approach
@@ -139,6 +256,10 @@ class DocumentExplorer:
                 if status_callback:
                     status_callback(f"Analyzing... (step {iteration + 1})")
 
+                # Collect streamed chunks and join once at the end
+                parts = []
+                total_len = 0
+
                 # Call Ollama with streaming for interruptibility
                 try:
                     stream = ollama.chat(
@@ -151,7 +272,6 @@ class DocumentExplorer:
                         stream=True
                     )
 
-                    assistant_message = ""
                     chunk_count = 0
                     max_chunks = 2000  # Safety limit to prevent infinite streaming
                     max_length = 16000  # Max response length in chars
@@ -163,21 +283,17 @@ class DocumentExplorer:
 
                         # Safety checks to prevent infinite loops
                         if chunk_count > max_chunks:
-                            assistant_message += "\n\n[Response truncated: exceeded maximum chunks]"
+                            parts.append("\n\n[Response truncated: exceeded maximum chunks]")
                             break
 
-                        if len(assistant_message) > max_length:
-                            assistant_message += "\n\n[Response truncated: exceeded maximum length]"
+                        if total_len > max_length:
+                            parts.append("\n\n[Response truncated: exceeded maximum length]")
                             break
 
                         if 'message' in chunk and 'content' in chunk['message']:
                             content = chunk['message']['content']
-                            # Handle potential encoding issues (surrogate characters)
-                            try:
-                                content = content.encode('utf-8', errors='ignore').decode('utf-8')
-                            except:
-                                pass
-                            assistant_message += content
+                            parts.append(content)
+                            total_len += len(content)
 
                             # Stream output in real-time if callback provided
                             if stream_callback and content:
@@ -186,16 +302,16 @@ class DocumentExplorer:
                                     first_chunk_received = True
                                     # Call with empty string to trigger spinner stop
                                     stream_callback("")
-                                # Stream each character
-                                for char in content:
-                                    stream_callback(char, char_mode=True)
+                                stream_callback(content)
 
                 except Exception as e:
                     if verbose:
                         print(f"⚠ Streaming error: {str(e)}")
                     # Return what we have so far or error message
-                    if not assistant_message:
-                        assistant_message = f"Error during response generation: {str(e)}"
+                    if not any(parts):
+                        parts = [f"Error during response generation: {str(e)}"]
+
+                assistant_message = ''.join(parts)
 
                 messages.append({"role": "assistant", "content": assistant_message})
 
@@ -204,16 +320,11 @@ class DocumentExplorer:
 
                 # Check if AI wants to use a tool
                 # Simple parsing: look for "Action: tool_name" and "Action Input: input"
-                if "Action:" in assistant_message and "Action Input:" in assistant_message:
-                    lines = assistant_message.split('\n')
-                    action_line = None
-                    input_line = None
-
-                    for line in lines:
-                        if line.strip().startswith("Action:"):
-                            action_line = line.split("Action:")[1].strip()
-                        elif line.strip().startswith("Action Input:"):
-                            input_line = line.split("Action Input:")[1].strip()
+                action_match = _ACTION_RE.search(assistant_message)
+                input_match = _ACTION_INPUT_RE.search(assistant_message)
+                if action_match and input_match:
+                    action_line = action_match.group(1).strip()
+                    input_line = input_match.group(1).strip()
 
                     if action_line and input_line:
                         if verbose:
@@ -240,10 +351,11 @@ class DocumentExplorer:
                         continue
 
                 # Check if AI has final answer
-                if "Final Answer:" in assistant_message:
-                    final_answer = assistant_message.split("Final Answer:")[1].strip()
+                final_match = _FINAL_RE.search(assistant_message)
+                if final_match:
+                    final_answer = final_match.group(1).strip()
 
-                    # Note: Output already streamed char-by-char in lines 190-191
+                    # Note: Output already streamed chunk-by-chunk via stream_callback
                     # No need to stream again here
 
                     # Save to conversation history
@@ -258,7 +370,7 @@ class DocumentExplorer:
                 # If no action and no final answer, treat response as final answer
                 # This handles cases where AI directly answers without using "Final Answer:" format
                 if "Action:" not in assistant_message:
-                    # Note: Output already streamed char-by-char in lines 190-191
+                    # Note: Output already streamed chunk-by-chunk via stream_callback
                     # No need to stream again here
 
                     # Save to conversation history
@@ -329,8 +441,7 @@ Final answer here."""
                 # Use streaming for interruptible generation
                 stream = ollama.chat(
                     model=self.model,
-                    messages=[{"role": "system", "content": system_prompt}] +
-                             self.conversation_history,
+                    messages=[{"role": "system", "content": system_prompt}, *self.conversation_history],
                     options={
                         "temperature": self.temperature,
                         "num_ctx": 8192,  # Limit context to 8K for better performance
@@ -338,14 +449,14 @@ Final answer here."""
                     stream=True
                 )
 
-                answer = ""
+                answer_parts = []
                 first_chunk = True
                 in_think_block = False
 
                 for chunk in stream:
                     if 'message' in chunk and 'content' in chunk['message']:
                         content = chunk['message']['content']
-                        answer += content
+                        answer_parts.append(content)
                         if stream_output:
                             # On first chunk, stop the spinner and switch to streaming output
                             if first_chunk:
@@ -376,6 +487,7 @@ Final answer here."""
                 if stream_output:
                     print()  # New line after streaming
 
+                answer = ''.join(answer_parts)
                 self.conversation_history.append({"role": "assistant", "content": answer})
 
                 return answer
@@ -396,16 +508,43 @@ Final answer here."""
             in_think = False
             in_sources = False
 
-            def stream_char_by_char(text, char_mode=False):
-                """Stream output character by character with color formatting
+            pending = []  # Encoded output for the current chunk
+            encoding = sys.stdout.encoding or 'utf-8'
+
+            def write_styled(text):
+                """Queue text in the color of the current section"""
+                if not text:
+                    return
+                data = text.encode(encoding, errors='replace')
+                if in_sources:
+                    pending.extend((_ANSI_DIM, data, _ANSI_RESET))
+                elif in_think:
+                    pending.extend((_ANSI_GRAY, data, _ANSI_RESET))
+                else:
+                    pending.append(data)
+
+            def flush_pending():
+                """Write queued output to the terminal in one call"""
+                data = b''.join(pending)
+                pending.clear()
+                out = getattr(sys.stdout, 'buffer', None)
+                if out is None:
+                    sys.stdout.write(data.decode(encoding, errors='replace'))
+                    sys.stdout.flush()
+                else:
+                    sys.stdout.flush()  # Keep ordering with earlier print() output
+                    out.write(data)
+                    out.flush()
+
+            def stream_chunk(text):
+                """Stream a chunk of output with color formatting
 
                 Args:
-                    text: Text to stream (single char if char_mode=True, full text otherwise)
-                    char_mode: If True, treat text as single character and print immediately
+                    text: Chunk of streamed text (empty string signals the first chunk)
                 """
                 nonlocal first_char_printed, accumulated_text, in_think, in_sources
 
-                # Stop spinner on first character (empty string signals start)
+                # Stop spinner on first chunk (empty string signals start)
                 if not first_char_printed and text == "":
                     if live_display:
                         try:
@@ -415,95 +554,58 @@ Final answer here."""
                     first_char_printed = True
                     return
 
-                # If char_mode, accumulate and process character by character
-                if char_mode:
-                    try:
-                        safe_char = text.encode('utf-8', errors='ignore').decode('utf-8')
-                        if not safe_char:
-                            return
-
-                        accumulated_text += safe_char
-
-                        # Check if we just completed a tag
-                        if accumulated_text.endswith('<think>'):
-                            # Output everything before <think> in normal color
-                            before_tag = accumulated_text[:-7]
-                            if before_tag:
-                                print(before_tag, end='', flush=True)
-                            # Output <think> tag in purple
-                            print('\033[35m<think>\033[0m', end='', flush=True)
-                            accumulated_text = ""
+                try:
+                    # Lone surrogates cannot be written to the terminal; drop them here
+                    safe_text = text.translate(_SURROGATE_TABLE)
+                    if not safe_text:
+                        return
+
+                    # accumulated_text only ever holds a short partial-marker tail
+                    buffer = accumulated_text + safe_text
+                    pos = 0
+
+                    # Emit text up to each complete marker, switching color as we go
+                    while True:
+                        next_marker, next_pos = None, -1
+                        for marker in _STREAM_MARKERS:
+                            found = buffer.find(marker, pos)
+                            if found != -1 and (next_pos == -1 or found < next_pos):
+                                next_marker, next_pos = marker, found
+                        if next_marker is None:
+                            break
+
+                        write_styled(buffer[pos:next_pos])
+                        pos = next_pos + len(next_marker)
+
+                        pending.append(_STYLED_MARKERS[next_marker])
+                        if next_marker == '<think>':
                             in_think = True
-                            return
-
-                        elif accumulated_text.endswith('</think>'):
-                            # Output everything before </think> in dim gray
-                            before_tag = accumulated_text[:-8]
-                            if before_tag:
-                                print(f'\033[90m{before_tag}\033[0m', end='', flush=True)
-                            # Output </think> tag in purple
-                            print('\033[35m</think>\033[0m', end='', flush=True)
-                            accumulated_text = ""
+                        elif next_marker == '</think>':
                             in_think = False
-                            return
-
-                        elif accumulated_text.endswith('-----'):
-                            # Output everything before ----- in normal color
-                            before_sep = accumulated_text[:-5]
-                            if before_sep:
-                                print(before_sep, end='', flush=True)
-                            # Output separator in dim
-                            print('\n\033[2m-----\033[0m\n', end='', flush=True)
-                            accumulated_text = ""
+                        else:
                             in_sources = True
-                            return
-
-                        # Check if we're building a potential tag (keep accumulating)
-                        # Only keep short buffer for specific tags we care about
-                        if len(accumulated_text) <= 8:  # Only buffer very short strings
-                            potential_tags = ['<', '<t', '<th', '<thi', '<thin', '<think',
-                                             '</', '</t', '</th', '</thi', '</thin', '</think',
-                                             '-', '--', '---', '----']
-                            if accumulated_text.endswith(tuple(potential_tags)):
-                                return  # Keep accumulating
-
-                        # Normal output - not building a tag, or buffer is too long
-                        if accumulated_text:
-                            if in_sources:
-                                print(f'\033[2m{accumulated_text}\033[0m', end='', flush=True)
-                            elif in_think:
-                                print(f'\033[90m{accumulated_text}\033[0m', end='', flush=True)
-                            else:
-                                print(accumulated_text, end='', flush=True)
-                            accumulated_text = ""
 
-                    except:
-                        pass
-                else:
-                    # Original mode: print full text char by char
-                    import time
-                    for char in text:
-                        try:
-                            safe_char = char.encode('utf-8', errors='ignore').decode('utf-8')
-                            if safe_char:
-                                print(safe_char, end='', flush=True)
-                                time.sleep(0.005)  # 5ms delay
-                        except:
-                            pass
-                    print()  # New line at end
+                    # Hold back a trailing partial marker until the next chunk completes it
+                    keep = 0
+                    for size in range(min(_MAX_PARTIAL_MARKER, len(buffer) - pos), 0, -1):
+                        if buffer[-size:] in _PARTIAL_MARKERS:
+                            keep = size
+                            break
+                    split = len(buffer) - keep
+                    write_styled(buffer[pos:split])
+                    accumulated_text = buffer[split:]
+                    flush_pending()
+
+                except:
+                    pass
 
             # Call ask() with streaming callback
             if stream_output:
-                result = self.ask(message, verbose=False, stream_callback=stream_char_by_char)
+                result = self.ask(message, verbose=False, stream_callback=stream_chunk)
 
                 # Flush any remaining accumulated text
-                if accumulated_text:
-                    if in_sources:
-                        print(f'\033[2m{accumulated_text}\033[0m', end='', flush=True)
-                    elif in_think:
-                        print(f'\033[90m{accumulated_text}\033[0m', end='', flush=True)
-                    else:
-                        print(accumulated_text, end='', flush=True)
+                write_styled(accumulated_text)
+                flush_pending()
 
                 # Reset color at the end
                 print('\033[0m', end='', flush=True)
@@ -521,7 +623,9 @@ Final answer here."""
 
     def clear_history(self):
         """Clear conversation history"""
-        self.conversation_history = []
+        self.conversation_history.clear()
+        _answer_looks_incomplete.cache_clear()
+        _extract_keywords.cache_clear()
 
     def rebuild_map(self):
         """Rebuild the knowledge map"""
@@ -530,7 +634,8 @@ Final answer here."""
         print(result)
 
         # Reload the map
-        self.knowledge_map = load_knowledge_map(str(self.directory))
+        self._load_knowledge_map()
+        self.watcher.refresh()
 
         return result
 
@@ -548,8 +653,8 @@ Final answer here."""
 
     def reload_knowledge_map(self):
         """Reload the knowledge map from disk"""
-        self.knowledge_map = load_knowledge_map(str(self.directory))
-        self.watcher = DocumentWatcher(str(self.directory))  # Reset watcher
+        self._load_knowledge_map()
+        self.watcher.refresh()  # Reset watcher baseline
 
     def check_for_updates(self) -> Optional[str]:
         """Check if documents have changed and return warning message if needed.
@@ -571,19 +676,7 @@ Final answer here."""
         Returns:
             True if answer seems incomplete
         """
-        incomplete_indicators = [
-            "I cannot",
-            "I don't have",
-            "no information",
-            "not found",
-            "unable to",
-            "無法",
-            "找不到",
-            "沒有資訊",
-        ]
-
-        answer_lower = answer.lower()
-        return any(indicator.lower() in answer_lower for indicator in incomplete_indicators)
+        return _answer_looks_incomplete(answer)
 
     def _fallback_keyword_search(self, question: str) -> str:
         """Perform keyword search as fallback when AI cannot answer.
@@ -594,13 +687,7 @@ Final answer here."""
         Returns:
             Search results or helpful message
         """
-        # Extract potential keywords (simple approach: words > 3 chars, excluding common words)
-        import re
-        from pathlib import Path
-
-        stop_words = {'what', 'when', 'where', 'which', 'who', 'how', 'the', 'this', 'that', 'with', 'from', 'for', 'are', 'was', 'were'}
-        words = re.findall(r'\b\w{4,}\b', question.lower())
-        keywords = [w for w in words if w not in stop_words]
+        keywords = _extract_keywords(question)
 
         if not keywords:
             return "💡 **Suggestion**: Try rephrasing your question or use 'locallm search <keyword>' to search documents directly."
@@ -614,19 +701,30 @@ Final answer here."""
         found_any = False
 
         try:
-            for file_path in self.directory.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in supported_exts:
-                    grep_result = grep.invoke({"pattern": keyword, "file_path": str(file_path), "context_lines": 2})
+            candidates = list(_iter_docs(str(self.directory), supported_exts))
+
+            # grep is I/O bound, so search files concurrently and stop at the first 3 hits
+            with ThreadPoolExecutor(max_workers=FALLBACK_SEARCH_WORKERS) as executor:
+                futures = {
+                    executor.submit(grep.invoke, {"pattern": keyword, "file_path": file_path, "context_lines": 2}): file_path
+                    for file_path in candidates
+                }
+                matches = 0
+                for future in as_completed(futures):
+                    grep_result = future.result()
 
                     if not grep_result.startswith("No matches"):
-                        result_lines.append(f"**In {file_path.name}:**")
+                        result_lines.append(f"**In {os.path.basename(futures[future])}:**")
                         # Show first 200 chars of result
                         result_lines.append(grep_result[:200] + "...")
                         result_lines.append("")
                         found_any = True
 
                         # Limit to first 3 files
-                        if len(result_lines) > 10:
+                        matches += 1
+                        if matches >= 3:
+                            for pending in futures:
+                                pending.cancel()
                             break
 
             if not found_any:
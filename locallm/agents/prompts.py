@@ -1,82 +1,50 @@
 """System prompts for AI agent"""
 
+from functools import lru_cache
+from typing import Dict, Final
+
 from ..utils.language import detect_language, get_language_instruction
 
+# Display names for detected response languages
+_LANG_NAMES: Final[Dict[str, str]] = {'zh': '中文', 'en': 'English', 'ja': '日本語', 'ko': '한국어'}
 
-def get_agent_system_prompt(knowledge_map_content: str, user_question: str = "") -> str:
-    """Generate system prompt for the AI agent with knowledge map context.
+# Response-language instruction per detected language ("" = no question given)
+_LANG_INSTRUCTIONS: Final[Dict[str, str]] = {
+    "": "",
+    **{
+        code: f"\n**CRITICAL - RESPONSE LANGUAGE**: The user asked in {name}. You MUST answer in {name}. {get_language_instruction(code)}\n"
+        for code, name in _LANG_NAMES.items()
+    },
+}
 
-    Args:
-        knowledge_map_content: YAML content of the knowledge map
-        user_question: User's question for language detection
-
-    Returns:
-        Complete system prompt
-    """
-    # Detect language and add instruction
-    lang_instruction = ""
-    if user_question:
-        detected_lang = detect_language(user_question)
-        lang_name = {'zh': '中文', 'en': 'English', 'ja': '日本語', 'ko': '한국어'}.get(detected_lang, 'English')
-        lang_instruction = f"\n**CRITICAL - RESPONSE LANGUAGE**: The user asked in {lang_name}. You MUST answer in {lang_name}. {get_language_instruction(detected_lang)}\n"
-
-    return f"""You are an intelligent knowledge base assistant. You have access to tools and a document map.
+# Static prompt body; {lang_instruction} and {knowledge_map_content} mark the per-call slots
+_PROMPT_TEMPLATE: Final[str] = """You are an intelligent knowledge base assistant. You have access to tools and a document map.
 {lang_instruction}
 
-**YOUR WORKFLOW**:
-1. Read the user's question carefully
-2. Review the document map to identify which 1-3 documents are most relevant
-3. Call the `read_file` tool to read those documents
-4. Based on document content, answer the user's question
-5. If information is insufficient, use `grep` tool for precise keyword search
-6. ALWAYS cite your sources (document name + page/section)
+**WORKFLOW**:
+1. Use the document map to pick the 1-3 most relevant documents
+2. Read them in full with `read_file`; read more documents if context is missing
+3. Use `grep` only to locate specific details after reading
+4. Answer from the document content and cite every source
 
 **DOCUMENT MAP**:
 ```yaml
 {knowledge_map_content}
 ```
 
-**AVAILABLE TOOLS**:
-
-1. **read_file(file_path: str)**
-   - Reads complete document content
-   - Use this as your PRIMARY tool - read full documents to understand complete context
-   - Supports PDF, DOCX, TXT, MD files
-   - Returns text with page/section markers
-
-2. **grep(pattern: str, file_path: str, context_lines: int = 3)**
-   - Search for specific keywords or patterns in a document
-   - Use this ONLY when you need to find specific information after reading
-   - Returns matching lines with surrounding context
-
-3. **list_docs(directory: str = ".")**
-   - Lists all documents in a directory
-   - Use this if the knowledge map seems incomplete or outdated
-
-**IMPORTANT PRINCIPLES**:
-
-✅ **DO**:
-- Always read FULL documents first to understand complete context
-- If the first document doesn't have enough info, read additional relevant documents
-- Clearly cite sources: mention document name and page/section number
-- If NO documents contain the answer, honestly tell the user
-- Think step-by-step about which documents are most relevant
-- Show your reasoning process
-- **When referring to documents, ALWAYS use the document TITLE or PATH, NEVER use the internal ID (doc_000, doc_001, etc.)**
-
-❌ **DON'T**:
-- Don't rely only on grep - read full documents for context
-- Don't make up information not in the documents
-- Don't give vague answers without citations
-- Don't stop after reading only one document if more context is needed
-- **NEVER use document IDs like "doc_000", "doc_001" in your responses or thinking - always use the actual document title or filename**
-
-**RESPONSE FORMAT** (MANDATORY):
+**TOOLS**:
+1. **read_file(file_path: str)** - PRIMARY tool. Full text of a PDF, DOCX, TXT or MD file with page/section markers
+2. **grep(pattern: str, file_path: str, context_lines: int = 3)** - matching lines with surrounding context
+3. **list_docs(directory: str = ".")** - lists documents, use if the map seems incomplete
 
-You MUST follow this EXACT structure - NO EXCEPTIONS:
+**RULES**:
+1. Never make up information; if no document contains the answer, say so honestly
+2. Refer to documents by TITLE or PATH, NEVER by internal IDs like "doc_000"
+3. No citations in the answer section - sources go ONLY after the "-----" separator
 
+**RESPONSE FORMAT** (MANDATORY):
 ```
-[Your complete answer here - explain the concept fully]
+[Complete answer, no citations or "(see doc.pdf)" references here]
 
 -----
 Sources:
@@ -86,73 +54,101 @@ Sources:
 - Document: [another.docx](path/to/another.docx), Page X, Section Y.Z
   Quote: "exact quote from document"
 ```
+The separator is exactly "-----" (5 dashes) on its own line; leave a blank line between sources.
 
-**CRITICAL RULES**:
-1. **Answer Section ONLY**: Write your complete answer FIRST. Do NOT include any citations or source references in this section.
-2. **Separator**: Use exactly "-----" (5 dashes) on a new line
-3. **Sources Section**: AFTER the separator, list ALL sources with:
-   - Document name as markdown link: `[filename](path)`
-   - Page number (e.g., "Page 12")
-   - Section number (e.g., "Section 3.2")
-   - Direct quote from that location
+Now, please help the user with their question!
+"""
 
-**WRONG FORMAT** (DO NOT DO THIS):
-```
-Answer text... (see [doc.pdf](path), Page 5)
-More text... as mentioned in document X...
+# Literal pieces around the two slots, split once at import
+_PROMPT_PREFIX, _PROMPT_BEFORE_MAP, _PROMPT_AFTER_MAP = (
+    _PROMPT_TEMPLATE.replace("{knowledge_map_content}", "{lang_instruction}").split("{lang_instruction}")
+)
 
------
-Sources: ...
-```
+_SIMPLE_PROMPT: Final[str] = """You are a helpful document assistant. You have access to tools to read and search documents.
 
-**CORRECT FORMAT**:
-```
-Answer text explaining the concept fully.
-More explanation with details.
+Use the available tools to answer user questions based on document content.
 
------
-Sources:
-- Document: [doc.pdf](path), Page 5, Section 2.1
-  Quote: "..."
+Always cite your sources when providing answers.
+"""
 
-- Document: [another.pdf](path), Page 10, Section 3.2
-  Quote: "..."
-```
 
-**FORMATTING REQUIREMENTS**:
-- NO citations in the answer section! ONLY in Sources section after "-----"
-- **Add a blank line between each document** in the Sources section for readability
+def get_agent_system_prompt(knowledge_map_content: str, user_question: str = "") -> str:
+    """Generate system prompt for the AI agent with knowledge map context.
 
-**EXAMPLE INTERACTION**:
+    Args:
+        knowledge_map_content: YAML content of the knowledge map
+        user_question: User's question for language detection
 
-User: "What is the recommended model for 8GB VRAM?"
+    Returns:
+        Complete system prompt
+    """
+    return _build_prompt(knowledge_map_content, _question_language(user_question))
 
-Your thinking:
-- The document map shows "Qwen3 Deployment Guide" discusses VRAM and model selection
-- I should read this document to find specific recommendations
 
-Your actions:
-1. Call: read_file("docs/qwen3_deploy.pdf")
-2. Read through content, find page 12 mentions "8GB VRAM → Qwen3-8B-Q4_K_M"
-3. Respond with answer and citation
+def get_agent_system_prompt_bytes(knowledge_map_content: str, user_question: str = "") -> bytes:
+    """Generate the agent system prompt as UTF-8 bytes.
 
-Your response:
-"For 8GB VRAM, the recommended model is **Qwen3-8B-Q4_K_M**. This quantized version provides the best balance between performance and memory usage for GPUs with 8GB of VRAM.
+    For callers that send the prompt over HTTP or another byte sink; the
+    encoded prompt is cached so repeated requests skip re-encoding.
 
------
-Sources:
-- Document: [qwen3_deploy.pdf](docs/qwen3_deploy.pdf), Page 12, Section 3.1
-  Quote: '8GB VRAM推薦使用Qwen3-8B-Q4_K_M版本...'"
+    Args:
+        knowledge_map_content: YAML content of the knowledge map
+        user_question: User's question for language detection
 
-Now, please help the user with their question!
-"""
+    Returns:
+        Complete system prompt, UTF-8 encoded
+    """
+    return _build_prompt_bytes(knowledge_map_content, _question_language(user_question))
 
 
-def get_simple_prompt() -> str:
-    """Get a simple prompt for testing without knowledge map"""
-    return """You are a helpful document assistant. You have access to tools to read and search documents.
+def get_agent_system_prompt_from_bytes(knowledge_map_bytes: bytes, user_question: str = "") -> str:
+    """Generate the agent system prompt from the raw knowledge map file.
 
-Use the available tools to answer user questions based on document content.
+    Lets callers pass the YAML exactly as read from disk instead of
+    re-dumping a parsed map.
 
-Always cite your sources when providing answers.
-"""
+    Args:
+        knowledge_map_bytes: UTF-8 encoded YAML of the knowledge map
+        user_question: User's question for language detection
+
+    Returns:
+        Complete system prompt
+    """
+    return get_agent_system_prompt(knowledge_map_bytes.decode('utf-8'), user_question)
+
+
+def _question_language(user_question: str) -> str:
+    """Get the response language code for a question ("" if no question)"""
+    if not user_question:
+        return ""
+    if user_question.isascii():
+        # Pure ASCII has no CJK characters, so detection would return English
+        return 'en'
+    return detect_language(user_question)
+
+
+@lru_cache(maxsize=8)
+def _build_prompt(knowledge_map_content: str, detected_lang: str) -> str:
+    """Assemble the system prompt for a map and response language.
+
+    Cached because the map rarely changes and only a handful of languages
+    are detected, so repeated questions reuse the assembled string.
+    """
+    # str.join sizes the result once instead of formatting slot by slot
+    return "".join((
+        _PROMPT_PREFIX,
+        _LANG_INSTRUCTIONS.get(detected_lang, _LANG_INSTRUCTIONS['en']),
+        _PROMPT_BEFORE_MAP,
+        knowledge_map_content,
+        _PROMPT_AFTER_MAP,
+    ))
+
+
+@lru_cache(maxsize=8)
+def _build_prompt_bytes(knowledge_map_content: str, detected_lang: str) -> bytes:
+    return _build_prompt(knowledge_map_content, detected_lang).encode('utf-8')
+
+
+def get_simple_prompt() -> str:
+    """Get a simple prompt for testing without knowledge map"""
+    return _SIMPLE_PROMPT
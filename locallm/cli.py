@@ -2,8 +2,14 @@
 """LocalLM CLI Main Program"""
 
 import os
+import shutil
+import signal
+import subprocess
 import sys
+import time
+from collections import namedtuple
 from pathlib import Path
+from functools import lru_cache
 import click
 from rich.console import Console
 
@@ -17,187 +23,395 @@ if sys.platform == 'win32':
             sys.stderr.reconfigure(encoding='utf-8')  # type: ignore
     except Exception:
         pass  # If reconfigure fails, continue anyway
-from rich.panel import Panel
-from rich.text import Text
-from rich.table import Table
-from rich.markdown import Markdown
-from rich.live import Live
-from rich.spinner import Spinner
-from rich.syntax import Syntax
-
-from .agents.explorer import DocumentExplorer
-from .tools.file_ops import list_docs, grep
-from .tools.map_generator import generate_knowledge_map
-from .utils.config import get_default_model
+
+# Heavier modules (Rich renderables, the agent, document tools) are imported
+# inside the commands that use them, so --help and completion start fast
 
 console = Console()
 
+# Document types searched by the search command
+SUPPORTED_EXTS = frozenset({'.pdf', '.docx', '.doc', '.txt', '.md', '.markdown'})
 
-def handle_slash_command(command: str, explorer, console):
-    """Handle slash commands in chat mode"""
-    parts = command[1:].split(maxsplit=1)  # Remove leading '/' and split
-    cmd = parts[0].lower()
-    args = parts[1] if len(parts) > 1 else ""
+# Tool, VCS and build directories skipped when searching the whole tree
+SKIP_DIRS = frozenset({'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build'})
 
-    if cmd == 'help':
-        # Show available commands
-        help_table = Table(title="Available Slash Commands", show_header=True, header_style="bold cyan")
-        help_table.add_column("Command", style="green")
-        help_table.add_column("Description", style="dim")
-
-        help_table.add_row("/help", "Show this help message")
-        help_table.add_row("/list", "List all documents in knowledge base")
-        help_table.add_row("/search <keyword>", "Search for keyword in documents")
-        help_table.add_row("/models", "List available Ollama models")
-        help_table.add_row("/model <name>", "Switch to a different model")
-        help_table.add_row("/rebuild", "Rebuild knowledge map")
-        help_table.add_row("/rebuild --fast", "Rebuild knowledge map (fast mode)")
-        help_table.add_row("/clear", "Clear conversation history")
-        help_table.add_row("/exit or /quit", "Exit chat mode")
+# grep is I/O bound, so search runs several files at once
+SEARCH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-        console.print()
-        console.print(help_table)
-        console.print()
+# Plain-text document types ripgrep can search directly (PDF/DOCX need text extraction)
+TEXT_EXTS = frozenset({'.txt', '.md', '.markdown'})
 
-    elif cmd == 'list':
-        # List documents
-        docs = explorer.list_documents()
-        console.print()
-        console.print(f"[cyan]📚 Found {len(docs)} document(s):[/cyan]")
-        console.print()
+# ripgrep, if installed, handles /search over plain-text documents
+_RG = shutil.which('rg')
 
-        for doc in docs:
-            console.print(f"  • [bold]{doc['title']}[/bold]")
-            console.print(f"    [dim]{doc['path']}[/dim]")
-            if doc.get('key_concepts'):
-                concepts = ", ".join(doc['key_concepts'][:5])
-                console.print(f"    [yellow]Key concepts:[/yellow] {concepts}")
-            console.print()
+GB = 1 << 30
 
-    elif cmd == 'search':
-        if not args:
-            console.print("[yellow]Usage: /search <keyword>[/yellow]")
-            return
+# Plain chat inputs that end the session
+_EXIT_CMDS = frozenset({'exit', 'quit', 'bye'})
 
-        # Perform grep search
-        console.print()
-        console.print(f"[cyan]🔍 Searching for: {args}[/cyan]")
-        console.print()
+# A second Ctrl+C within this many seconds exits instead of interrupting
+DOUBLE_INTERRUPT_WINDOW = 2.0
+_last_interrupt = 0.0
 
-        results = grep(args, os.getcwd())
-        if results:
-            console.print(results)
-        else:
-            console.print("[dim]No results found[/dim]")
-        console.print()
 
-    elif cmd == 'model':
-        # Switch model
-        if not args:
-            console.print("[yellow]Usage: /model <model_name>[/yellow]")
-            console.print("[dim]Example: /model llama3[/dim]")
-            console.print("[dim]Use /models to see available models[/dim]")
-            return
+def _sigint_handler(signum, frame):
+    """Raise KeyboardInterrupt, or exit if Ctrl+C was pressed twice in quick succession"""
+    global _last_interrupt
+    now = time.monotonic()
+    if now - _last_interrupt < DOUBLE_INTERRUPT_WINDOW:
+        console.print("\n[yellow]Exiting...[/yellow]")
+        raise SystemExit(0)
+    _last_interrupt = now
+    raise KeyboardInterrupt
 
-        # Switch to new model
-        new_model = args.strip()
-        old_model = explorer.model
-        explorer.model = new_model
-        console.print()
-        console.print(f"[green]✓ Switched from {old_model} to {new_model}[/green]")
-        console.print()
+# ollama.list() is reused for a few seconds so repeated /models skip the daemon round trip
+MODELS_CACHE_TTL = 5.0
+_models_cache = None  # (time.monotonic() of the call, ollama.list() response)
 
-    elif cmd == 'models':
-        # List Ollama models
-        import ollama
-        console.print()
-        console.print("[cyan]Available Ollama Models:[/cyan]")
-        console.print()
 
+def _list_ollama_models():
+    """Get ollama.list(), reusing a response younger than MODELS_CACHE_TTL"""
+    global _models_cache
+    import ollama
+
+    now = time.monotonic()
+    if _models_cache is None or now - _models_cache[0] > MODELS_CACHE_TTL:
+        _models_cache = (now, ollama.list())
+    return _models_cache[1]
+
+
+@lru_cache(maxsize=256)
+def _fmt_modified(modified: str, fmt: str = '%Y-%m-%d', fallback: str = 'Unknown') -> str:
+    """Format an ISO-8601 modified_at timestamp (fallback if unparsable)"""
+    from datetime import datetime
+
+    try:
+        return datetime.fromisoformat(modified.replace('Z', '+00:00')).strftime(fmt)
+    except ValueError:
+        return fallback
+
+
+def _iter_document_files(root: str, exts=SUPPORTED_EXTS) -> list:
+    """Find document files under root, skipping SKIP_DIRS.
+
+    Args:
+        root: Directory to walk
+        exts: Lowercase file extensions to include
+
+    Returns:
+        Absolute path strings in walk order
+    """
+    files = []
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        # Prune in place so os.walk never descends into skipped directories
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+
+        for name in filenames:
+            # Check the extension on the name before touching the file
+            if os.path.splitext(name)[1].lower() in exts:
+                files.append(os.path.join(dirpath, name))
+
+    return files
+
+
+def _grep_documents(pattern: str, root: str, exts=SUPPORTED_EXTS, context_lines: int = 2):
+    """Grep every document under root concurrently.
+
+    Args:
+        pattern: Search pattern (regex, case-insensitive)
+        root: Directory to search
+        exts: Lowercase file extensions to include
+        context_lines: Lines of context around each match
+
+    Yields:
+        (file_path, grep result) for files with matches, in walk order
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from .tools.file_ops import grep
+
+    files = _iter_document_files(root, exts)
+
+    def search_file(file_path):
+        return grep.invoke({"pattern": pattern, "file_path": file_path, "context_lines": context_lines})
+
+    # Read and search files concurrently; map() yields results in walk
+    # order, so callers can stream output as soon as the next file is done
+    with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as executor:
+        for file_path, result in zip(files, executor.map(search_file, files)):
+            if not result.startswith("No matches"):
+                yield file_path, result
+
+
+def _rg_search(pattern: str, root: str) -> str:
+    """Search plain-text documents under root with ripgrep.
+
+    Args:
+        pattern: Search pattern (regex, case-insensitive)
+        root: Directory to search
+
+    Returns:
+        ripgrep's colored output, or "" if nothing matched or rg failed
+    """
+    # --hidden/--no-ignore: search the same files as the Python walk, which does
+    # not skip dotfiles or anything listed in .gitignore/.ignore/.rgignore
+    cmd = [_RG, '--color=always', '--ignore-case', '--line-number', '--context', '2',
+           '--hidden', '--no-ignore', '--no-messages']
+    for ext in sorted(TEXT_EXTS):
+        cmd += ['--iglob', f'*{ext}']
+    for skip_dir in sorted(SKIP_DIRS):
+        cmd += ['--iglob', f'!{skip_dir}/']
+    cmd += ['--', pattern, root]
+
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace', timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return ""
+    # Exit code 1 means no matches, 2 an error such as a regex rg cannot parse
+    return proc.stdout if proc.returncode == 0 else ""
+
+
+def _warm_up_model(model: str):
+    """Start loading the model in Ollama on a background thread.
+
+    Loading a model into memory takes seconds; doing it while the knowledge
+    map loads (and the user types) keeps it off the first question's latency.
+    """
+    import threading
+
+    def load():
         try:
-            models_response = ollama.list()
-            model_table = Table(show_header=True, header_style="bold cyan")
-            model_table.add_column("Model Name", style="green")
-            model_table.add_column("Size", style="dim")
-            model_table.add_column("Modified", style="dim")
+            import ollama
+            # An empty prompt makes Ollama load the model without generating anything
+            ollama.generate(model=model, prompt='')
+        except Exception:
+            pass  # Connection or model errors surface on the real request
 
-            current_model = explorer.model
+    threading.Thread(target=load, name="ollama-warmup", daemon=True).start()
 
-            # Handle both dict and object responses
-            if hasattr(models_response, 'models'):
-                models_list = models_response.models
-            else:
-                models_list = models_response.get('models', [])
-
-            for model in models_list:
-                # Get model name - could be 'model' or 'name' field
-                if hasattr(model, 'model'):
-                    name = model.model
-                    size = model.size if hasattr(model, 'size') else 0
-                    modified = model.modified_at if hasattr(model, 'modified_at') else None
-                else:
-                    name = model.get('model') or model.get('name', 'Unknown')
-                    size = model.get('size', 0)
-                    modified = model.get('modified_at')
 
-                # Handle size - could be int or string
-                try:
-                    size_gb = int(size) / (1024**3) if size else 0
-                except (ValueError, TypeError):
-                    size_gb = 0
-
-                # Mark current model
-                display_name = name
-                if name == current_model:
-                    display_name = f"→ {name} (current)"
-
-                modified = model.get('modified_at', 'Unknown')
-                modified_str = 'Unknown'
-                if modified and modified != 'Unknown':
-                    try:
-                        from datetime import datetime
-                        modified_str = datetime.fromisoformat(str(modified).replace('Z', '+00:00')).strftime('%Y-%m-%d')
-                    except:
-                        modified_str = 'Unknown'
+# One installed model: name, size in bytes, modified_at as a string (or None)
+ModelRow = namedtuple('ModelRow', ['name', 'size', 'modified'])
 
-                model_table.add_row(display_name, f"{size_gb:.2f} GB", str(modified_str))
 
-            console.print(model_table)
-            console.print()
-            console.print("[dim]Use /model <name> to switch model in chat, or use -m flag: locallm chat -m <model_name>[/dim]")
-            console.print()
-        except Exception as e:
-            console.print(f"[red]Error listing models: {str(e)}[/red]")
+def _normalize_models(response) -> list:
+    """Flatten an ollama.list() response into ModelRow tuples.
 
-    elif cmd == 'rebuild':
-        # Rebuild knowledge map
-        fast_mode = '--fast' in args
-        console.print()
-        console.print(f"[cyan]🔄 Rebuilding knowledge map{'(fast mode)' if fast_mode else ''}...[/cyan]")
-        console.print()
+    Resolves the object-vs-dict response shapes and the 'model'/'name' field
+    once, so render loops work on plain values.
 
+    Args:
+        response: ollama.list() result (ListResponse object or dict)
+
+    Returns:
+        List of ModelRow
+    """
+    models = response.models if hasattr(response, 'models') else response.get('models', [])
+    rows = []
+
+    for model in models:
+        if hasattr(model, 'model'):
+            name, size, modified = model.model, getattr(model, 'size', 0), getattr(model, 'modified_at', None)
+        else:
+            name = model.get('model') or model.get('name', 'Unknown')
+            size, modified = model.get('size', 0), model.get('modified_at')
+
+        # Size could be int or string
         try:
-            generate_knowledge_map(os.getcwd(), use_ai=not fast_mode)
-            console.print("[green]✓ Knowledge map rebuilt successfully![/green]")
-            console.print()
+            size = int(size or 0)
+        except (ValueError, TypeError):
+            size = 0
 
-            # Reload explorer's knowledge map
-            explorer.reload_knowledge_map()
-            console.print(f"[dim]Loaded {explorer.get_document_count()} documents[/dim]")
-            console.print()
-        except Exception as e:
-            console.print(f"[red]Error: {str(e)}[/red]")
+        rows.append(ModelRow(name, size, str(modified) if modified else None))
+
+    return rows
+
+
+def _cmd_help(args: str, explorer, console):
+    """Show available slash commands"""
+    from rich.table import Table
+
+    help_table = Table(title="Available Slash Commands", show_header=True, header_style="bold cyan")
+    help_table.add_column("Command", style="green")
+    help_table.add_column("Description", style="dim")
+
+    help_table.add_row("/help", "Show this help message")
+    help_table.add_row("/list", "List all documents in knowledge base")
+    help_table.add_row("/search <keyword>", "Search for keyword in documents")
+    help_table.add_row("/models", "List available Ollama models")
+    help_table.add_row("/model <name>", "Switch to a different model")
+    help_table.add_row("/rebuild", "Rebuild knowledge map")
+    help_table.add_row("/rebuild --fast", "Rebuild knowledge map (fast mode)")
+    help_table.add_row("/clear", "Clear conversation history")
+    help_table.add_row("/exit or /quit", "Exit chat mode")
+
+    console.print()
+    console.print(help_table)
+    console.print()
+
+
+def _cmd_list(args: str, explorer, console):
+    """List documents in the knowledge map"""
+    from rich.text import Text
+
+    # List documents, built as one Text so Rich renders the listing in a single print
+    docs = explorer.list_documents()
+    listing = Text(f"\n📚 Found {len(docs)} document(s):\n\n", style="cyan")
+
+    for doc in docs:
+        listing.append("  • ")
+        listing.append(str(doc['title']), style="bold")
+        listing.append(f"\n    {doc['path']}\n", style="dim")
+        if doc.get('key_concepts'):
+            concepts = ", ".join(doc['key_concepts'][:5])
+            listing.append("    Key concepts:", style="yellow")
+            listing.append(f" {concepts}\n")
+        listing.append("\n")
+
+    console.print(listing, end="")
+
+
+def _cmd_search(args: str, explorer, console):
+    """Search documents for a keyword"""
+    if not args:
+        console.print("[yellow]Usage: /search <keyword>[/yellow]")
+        return
+
+    from rich.text import Text
 
-    elif cmd == 'clear':
-        # Clear conversation history
-        explorer.clear_history()
+    # Perform grep search
+    console.print()
+    console.print(f"[cyan]🔍 Searching for: {args}[/cyan]")
+    console.print()
+
+    root = os.getcwd()
+    found_any = False
+    exts = SUPPORTED_EXTS
+
+    if _RG:
+        rg_output = _rg_search(args, root)
+        if rg_output:
+            console.print(Text.from_ansi(rg_output))
+            found_any = True
+            # ripgrep covered the plain-text files; PDF/DOCX still need the Python path
+            exts = SUPPORTED_EXTS - TEXT_EXTS
+
+    for file_path, result in _grep_documents(args, root, exts):
+        console.print(result, markup=False)
         console.print()
-        console.print("[green]✓ Conversation history cleared[/green]")
+        found_any = True
+
+    if not found_any:
+        console.print("[dim]No results found[/dim]")
+    console.print()
+
+
+def _cmd_model(args: str, explorer, console):
+    """Switch the chat model"""
+    if not args:
+        console.print("[yellow]Usage: /model <model_name>[/yellow]")
+        console.print("[dim]Example: /model llama3[/dim]")
+        console.print("[dim]Use /models to see available models[/dim]")
+        return
+
+    # Switch to new model
+    new_model = args.strip()
+    old_model = explorer.model
+    explorer.model = new_model
+    console.print()
+    console.print(f"[green]✓ Switched from {old_model} to {new_model}[/green]")
+    console.print()
+
+
+def _cmd_models(args: str, explorer, console):
+    """List available Ollama models"""
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    try:
+        rows = _normalize_models(_list_ollama_models())
+        model_table = Table(show_header=True, header_style="bold cyan")
+        model_table.add_column("Model Name", style="green")
+        model_table.add_column("Size", style="dim")
+        model_table.add_column("Modified", style="dim")
+
+        current_model = explorer.model
+
+        for row in rows:
+            # Mark current model
+            display_name = row.name
+            if row.name == current_model:
+                display_name = f"→ {row.name} (current)"
+
+            modified_str = _fmt_modified(row.modified) if row.modified else 'Unknown'
+
+            model_table.add_row(display_name, f"{row.size / GB:.2f} GB", modified_str)
+
+        # Header, table and hint go out in a single render
+        console.print(Group(
+            Text("\nAvailable Ollama Models:\n", style="cyan"),
+            model_table,
+            Text("\nUse /model <name> to switch model in chat, or use -m flag: locallm chat -m <model_name>\n", style="dim"),
+        ))
+    except Exception as e:
+        console.print(f"[red]Error listing models: {str(e)}[/red]")
+
+
+def _cmd_rebuild(args: str, explorer, console):
+    """Rebuild the knowledge map and reload it"""
+    from .tools.map_generator import generate_knowledge_map
+
+    # Rebuild knowledge map
+    fast_mode = '--fast' in args
+    console.print()
+    console.print(f"[cyan]🔄 Rebuilding knowledge map{'(fast mode)' if fast_mode else ''}...[/cyan]")
+    console.print()
+
+    try:
+        generate_knowledge_map(os.getcwd(), use_ai=not fast_mode)
+        console.print("[green]✓ Knowledge map rebuilt successfully![/green]")
         console.print()
 
-    elif cmd in ['exit', 'quit']:
-        console.print("[yellow]Use 'exit' or 'quit' without slash to exit chat mode[/yellow]")
+        # Reload explorer's knowledge map
+        explorer.reload_knowledge_map()
+        console.print(f"[dim]Loaded {explorer.get_document_count()} documents[/dim]")
+        console.print()
+    except Exception as e:
+        console.print(f"[red]Error: {str(e)}[/red]")
+
+
+def _cmd_clear(args: str, explorer, console):
+    """Clear conversation history"""
+    explorer.clear_history()
+    console.print()
+    console.print("[green]✓ Conversation history cleared[/green]")
+    console.print()
+
 
+# Slash command name -> handler(args, explorer, console)
+SLASH_HANDLERS = {
+    'help': _cmd_help,
+    'list': _cmd_list,
+    'search': _cmd_search,
+    'model': _cmd_model,
+    'models': _cmd_models,
+    'rebuild': _cmd_rebuild,
+    'clear': _cmd_clear,
+}
+
+
+def handle_slash_command(command: str, explorer, console):
+    """Handle slash commands in chat mode"""
+    parts = command[1:].split(maxsplit=1)  # Remove leading '/' and split
+    cmd = parts[0].lower()
+    args = parts[1] if len(parts) > 1 else ""
+
+    handler = SLASH_HANDLERS.get(cmd)
+    if handler is not None:
+        handler(args, explorer, console)
+    elif cmd in ('exit', 'quit'):
+        console.print("[yellow]Use 'exit' or 'quit' without slash to exit chat mode[/yellow]")
     else:
         console.print()
         console.print(f"[yellow]Unknown command: /{cmd}[/yellow]")
@@ -205,18 +419,32 @@ def handle_slash_command(command: str, explorer, console):
         console.print()
 
 
-def display_welcome():
-    """Display welcome screen"""
-    # ASCII art for LOCALLM
-    welcome_text = Text()
-    welcome_text.append("""
+# ASCII art for LOCALLM
+WELCOME_ART = """
 ██╗      ██████╗  ██████╗ █████╗ ██╗     ██╗     ███╗   ███╗
 ██║     ██╔═══██╗██╔════╝██╔══██╗██║     ██║     ████╗ ████║
 ██║     ██║   ██║██║     ███████║██║     ██║     ██╔████╔██║
 ██║     ██║   ██║██║     ██╔══██║██║     ██║     ██║╚██╔╝██║
 ███████╗╚██████╔╝╚██████╗██║  ██║███████╗███████╗██║ ╚═╝ ██║
 ╚══════╝ ╚═════╝  ╚═════╝╚═╝  ╚═╝╚══════╝╚══════╝╚═╝     ╚═╝
-""", style="bold cyan")
+"""
+
+
+@lru_cache(maxsize=1)
+def _welcome_text():
+    """Build the styled welcome art once; Rich is only imported on first use"""
+    from rich.text import Text
+
+    welcome_text = Text()
+    welcome_text.append(WELCOME_ART, style="bold cyan")
+    return welcome_text
+
+
+def display_welcome():
+    """Display welcome screen"""
+    from rich.panel import Panel
+
+    welcome_text = _welcome_text()
 
     # Get current working directory
     current_dir = os.getcwd()
@@ -251,6 +479,11 @@ def main(ctx, model):
 @click.option('--model', '-m', default=None, help='Ollama model to use (overrides config)')
 def chat(model):
     """Start interactive chat session with the AI"""
+    from rich.live import Live
+    from rich.spinner import Spinner
+    from .agents.explorer import DocumentExplorer
+    from .utils.config import get_default_model
+
     # Use config default if not specified
     if model is None:
         model = get_default_model()
@@ -267,6 +500,7 @@ def chat(model):
     try:
         # Show initialization message
         console.print(f"[cyan]Initializing AI ({model})...[/cyan]")
+        _warm_up_model(model)
 
         # Initialize explorer (knowledge map generation will show its own progress)
         explorer = DocumentExplorer(
@@ -286,46 +520,44 @@ def chat(model):
         # Track Ctrl+C presses
         interrupt_count = 0
 
+        # One spinner display, started and stopped around each response
+        thinking_spinner = Spinner("dots", text="Thinking...", style="yellow dim")
+        live_display = Live(thinking_spinner, console=console, refresh_per_second=20)
+
         # Chat loop
         while True:
             try:
                 # Get user input
                 user_input = console.input("[bold blue]You:[/bold blue] ")
+                stripped = user_input.strip()
 
                 # Reset interrupt counter on new input
                 interrupt_count = 0
 
-                if user_input.strip().lower() in ['exit', 'quit', 'bye']:
+                if stripped.lower() in _EXIT_CMDS:
                     console.print("[yellow]Goodbye![/yellow]")
                     break
 
-                if not user_input.strip():
+                if not stripped:
                     continue
 
                 # Handle slash commands
-                if user_input.strip().startswith('/'):
-                    handle_slash_command(user_input.strip(), explorer, console)
+                if stripped.startswith('/'):
+                    handle_slash_command(stripped, explorer, console)
                     continue
 
                 # Get AI response
                 console.print()
 
-                live_display = None
                 try:
                     # Show thinking spinner with Live display
-                    from rich.live import Live
-                    from rich.spinner import Spinner
-
-                    thinking_spinner = Spinner("dots", text="Thinking...", style="yellow dim")
-                    live_display = Live(thinking_spinner, console=console, refresh_per_second=20)
-                    live_display.start()
+                    live_display.start(refresh=True)
 
                     # Stream response (explorer will stop the spinner when first chunk arrives)
                     response = explorer.chat(user_input, use_tools=True, stream_output=True, live_display=live_display)
 
                     # Stop live display if still running
-                    if live_display:
-                        live_display.stop()
+                    live_display.stop()
 
                     console.print()  # Extra newline
 
@@ -334,11 +566,10 @@ def chat(model):
 
                 except KeyboardInterrupt:
                     # Ensure live display is stopped
-                    if live_display:
-                        try:
-                            live_display.stop()
-                        except:
-                            pass
+                    try:
+                        live_display.stop()
+                    except:
+                        pass
 
                     interrupt_count += 1
                     if interrupt_count == 1:
@@ -367,6 +598,13 @@ def chat(model):
 @click.option('--verbose', '-v', is_flag=True, help='Show detailed reasoning process')
 def ask(question, model, verbose):
     """Ask the knowledge base a question"""
+    from rich.live import Live
+    from rich.markdown import Markdown
+    from rich.table import Table
+    from rich.text import Text
+    from .agents.explorer import DocumentExplorer
+    from .utils.config import get_default_model
+
     # Use config default if not specified
     if model is None:
         model = get_default_model()
@@ -377,12 +615,13 @@ def ask(question, model, verbose):
     console.print(f"[bold cyan]Question:[/bold cyan] {question_text}")
     console.print()
 
-    # Track Ctrl+C presses
-    interrupt_count = 0
+    # First Ctrl+C interrupts, a quick second one exits
+    previous_handler = signal.signal(signal.SIGINT, _sigint_handler)
 
     try:
         # Show initialization message
         console.print(f"[cyan]⚙️  Initializing AI ({model})...[/cyan]")
+        _warm_up_model(model)
 
         # Initialize document explorer (knowledge map generation will show its own progress)
         try:
@@ -398,18 +637,15 @@ def ask(question, model, verbose):
         console.print()
 
         # Ask question with live status updates
-        current_status = {"text": "Analyzing..."}
-
-        def update_status(message: str):
-            """Update status message"""
-            current_status["text"] = message
+        # One Text renderable is reused for every status; Live redraws it at its
+        # own refresh rate, so bursts of updates cost an assignment each
+        status_text = Text("", style="bold yellow")
 
         try:
             # Use Live display for status updates
-            with Live(console=console, refresh_per_second=4) as live:
+            with Live(status_text, console=console, refresh_per_second=4):
                 def status_update(msg):
-                    update_status(msg)
-                    live.update(f"[bold yellow]{current_status['text']}[/bold yellow]")
+                    status_text.plain = msg
 
                 result = explorer.ask(question_text, status_callback=status_update, verbose=verbose)
 
@@ -442,20 +678,7 @@ def ask(question, model, verbose):
                 console.print()
 
         except KeyboardInterrupt:
-            interrupt_count += 1
-            if interrupt_count == 1:
-                console.print("\n[yellow]⚠ Interrupted! Press Ctrl+C again to exit.[/yellow]")
-                # Wait for second Ctrl+C
-                try:
-                    import time
-                    time.sleep(2)  # Give user 2 seconds to press again
-                    console.print("[yellow]Resuming...[/yellow]")
-                except KeyboardInterrupt:
-                    console.print("\n[yellow]Exiting...[/yellow]")
-                    sys.exit(0)
-            else:
-                console.print("\n[yellow]Exiting...[/yellow]")
-                sys.exit(0)
+            console.print("\n[yellow]⚠ Interrupted![/yellow]")
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Operation cancelled by user[/yellow]")
@@ -466,11 +689,16 @@ def ask(question, model, verbose):
             import traceback
             console.print("[dim]" + traceback.format_exc() + "[/dim]")
         sys.exit(1)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
 
 
 @main.command()
 def list():
     """List all documents in the knowledge base"""
+    from rich.table import Table
+    from .tools.file_ops import scan_documents
+
     current_dir = os.getcwd()
 
     console.print()
@@ -479,16 +707,13 @@ def list():
 
     try:
         # Get document list
-        docs_output = list_docs.invoke(current_dir)
+        documents = scan_documents(current_dir)
 
-        if "No documents found" in docs_output:
+        if not documents:
             console.print("[yellow]No documents found in this directory[/yellow]")
             console.print("[dim]Supported formats: PDF, DOCX, TXT, MD[/dim]")
             return
 
-        # Parse and display as table
-        lines = docs_output.split('\n')
-
         # Create table
         table = Table(title="Documents in Knowledge Base", show_header=True, header_style="bold cyan")
         table.add_column("File Name", style="green")
@@ -496,42 +721,8 @@ def list():
         table.add_column("Size", style="blue")
         table.add_column("Path", style="dim")
 
-        # Parse document entries (simple parsing)
-        current_doc = {}
-        for line in lines[1:]:  # Skip first line (header)
-            if line.strip().startswith('•'):
-                # Document name line
-                if current_doc:
-                    table.add_row(
-                        current_doc.get('name', ''),
-                        current_doc.get('type', ''),
-                        current_doc.get('size', ''),
-                        current_doc.get('path', '')
-                    )
-                    current_doc = {}
-
-                # Parse: • filename.pdf (PDF, 123.45 KB)
-                parts = line.strip().split('(')
-                if len(parts) >= 2:
-                    name = parts[0].replace('•', '').strip()
-                    info = parts[1].rstrip(')')
-                    type_size = info.split(',')
-                    current_doc['name'] = name
-                    if len(type_size) >= 2:
-                        current_doc['type'] = type_size[0].strip()
-                        current_doc['size'] = type_size[1].strip()
-
-            elif line.strip().startswith('Path:'):
-                current_doc['path'] = line.split('Path:')[1].strip()
-
-        # Add last document
-        if current_doc:
-            table.add_row(
-                current_doc.get('name', ''),
-                current_doc.get('type', ''),
-                current_doc.get('size', ''),
-                current_doc.get('path', '')
-            )
+        for doc in documents:
+            table.add_row(doc['name'], doc['type'], f"{doc['size_kb']} KB", doc['path'])
 
         console.print(table)
         console.print()
@@ -546,6 +737,9 @@ def list():
 @click.option('--file', '-f', help='Search in specific file only')
 def search(keyword, file):
     """Search for keywords in documents"""
+    from rich.panel import Panel
+    from .tools.file_ops import grep
+
     current_dir = os.getcwd()
 
     console.print()
@@ -567,25 +761,20 @@ def search(keyword, file):
             console.print(panel)
         else:
             # Search in all documents
-            supported_exts = {'.pdf', '.docx', '.doc', '.txt', '.md', '.markdown'}
             found_any = False
 
-            for file_path in Path(current_dir).rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in supported_exts:
-                    result = grep.invoke({"pattern": keyword, "file_path": str(file_path), "context_lines": 2})
-
-                    if not result.startswith("No matches"):
-                        # Display in a panel for each file
-                        panel = Panel(
-                            result,
-                            title=f"[bold green]📄 {file_path.name}[/bold green]",
-                            subtitle=f"[dim]{file_path.relative_to(current_dir)}[/dim]",
-                            border_style="green",
-                            padding=(1, 2)
-                        )
-                        console.print(panel)
-                        console.print()
-                        found_any = True
+            for file_path, result in _grep_documents(keyword, current_dir):
+                # Display in a panel for each file; names are only derived for matches
+                panel = Panel(
+                    result,
+                    title=f"[bold green]📄 {os.path.basename(file_path)}[/bold green]",
+                    subtitle=f"[dim]{os.path.relpath(file_path, current_dir)}[/dim]",
+                    border_style="green",
+                    padding=(1, 2)
+                )
+                console.print(panel)
+                console.print()
+                found_any = True
 
             if not found_any:
                 console.print(f"[yellow]❌ No matches found for '{keyword}'[/yellow]")
@@ -598,17 +787,20 @@ def search(keyword, file):
 @main.command()
 def models():
     """List available Ollama models"""
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+    from .utils.config import get_default_model
+
     console.print()
     console.print("[bold cyan]Available Ollama Models[/bold cyan]")
     console.print()
 
     try:
-        import ollama
-
         # Get list of models from Ollama
-        model_list = ollama.list()
+        rows = _normalize_models(_list_ollama_models())
 
-        if not model_list or 'models' not in model_list or len(model_list['models']) == 0:
+        if not rows:
             console.print("[yellow]No models found. Please pull a model first:[/yellow]")
             console.print("[dim]  ollama pull qwen3:latest[/dim]")
             return
@@ -623,39 +815,29 @@ def models():
         table.add_column("Modified", style="blue")
         table.add_column("Default", style="magenta")
 
-        for model in model_list['models']:
-            model_name = model.get('name', 'Unknown')
-            size = model.get('size', 0)
+        for row in rows:
+            size = row.size
             # Convert size to human readable
-            if size > 1024**3:
-                size_str = f"{size / (1024**3):.1f} GB"
+            if size > GB:
+                size_str = f"{size / GB:.1f} GB"
             elif size > 1024**2:
                 size_str = f"{size / (1024**2):.1f} MB"
             else:
                 size_str = f"{size / 1024:.1f} KB"
 
             # Get modified time
-            import datetime
-            modified = model.get('modified_at', '')
-            if modified:
-                try:
-                    dt = datetime.datetime.fromisoformat(modified.replace('Z', '+00:00'))
-                    modified_str = dt.strftime('%Y-%m-%d %H:%M')
-                except:
-                    modified_str = modified[:16]
-            else:
-                modified_str = 'Unknown'
+            # Unparsable timestamps show their raw start instead
+            modified_str = _fmt_modified(row.modified, '%Y-%m-%d %H:%M', row.modified[:16]) if row.modified else 'Unknown'
 
             # Check if default
-            is_default = "✓" if model_name == default_model else ""
+            is_default = "✓" if row.name == default_model else ""
 
-            table.add_row(model_name, size_str, modified_str, is_default)
+            table.add_row(row.name, size_str, modified_str, is_default)
 
-        console.print(table)
-        console.print()
-        console.print(f"[dim]Default model: {default_model}[/dim]")
-        console.print(f"[dim]Change default in config.yaml or use --model flag[/dim]")
-        console.print()
+        console.print(Group(
+            table,
+            Text(f"\nDefault model: {default_model}\nChange default in config.yaml or use --model flag\n", style="dim"),
+        ))
 
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
@@ -668,6 +850,8 @@ def models():
 @click.option('--fast', is_flag=True, help='Fast mode: AI reads TOC/abstract only (faster)')
 def rebuild_map(fast):
     """Rebuild the knowledge map for current directory"""
+    from .tools.map_generator import generate_knowledge_map
+
     current_dir = os.getcwd()
 
     console.print()
@@ -679,7 +863,8 @@ def rebuild_map(fast):
     console.print("[dim]Press Ctrl+C to cancel[/dim]")
     console.print()
 
-    interrupt_count = 0
+    # First Ctrl+C cancels the build, a quick second one exits
+    previous_handler = signal.signal(signal.SIGINT, _sigint_handler)
 
     try:
         try:
@@ -690,20 +875,7 @@ def rebuild_map(fast):
             console.print()
 
         except KeyboardInterrupt:
-            interrupt_count += 1
-            if interrupt_count == 1:
-                console.print("\n[yellow]⚠ Interrupted! Press Ctrl+C again to exit.[/yellow]")
-                # Wait for second Ctrl+C
-                try:
-                    import time
-                    time.sleep(2)
-                    console.print("[yellow]Cancelled. Partial map may have been saved.[/yellow]")
-                except KeyboardInterrupt:
-                    console.print("\n[yellow]Exiting...[/yellow]")
-                    sys.exit(0)
-            else:
-                console.print("\n[yellow]Exiting...[/yellow]")
-                sys.exit(0)
+            console.print("\n[yellow]⚠ Interrupted! Cancelled. Partial map may have been saved.[/yellow]")
 
     except KeyboardInterrupt:
         console.print("\n[yellow]Map generation cancelled[/yellow]")
@@ -711,6 +883,8 @@ def rebuild_map(fast):
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {str(e)}")
         sys.exit(1)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
 
 
 if __name__ == '__main__':
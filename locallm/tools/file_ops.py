@@ -2,11 +2,18 @@
 
 import os
 import re
+import threading
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Optional, Union
+from typing import Collection, Iterator, List, Dict, Optional, Tuple, Union
 import fitz  # PyMuPDF
 from docx import Document
 
+# MuPDF is not thread-safe, so PDF extraction is serialized across threads
+_PDF_LOCK = threading.Lock()
+
+# Document types the tools can read
+SUPPORTED_EXTS = frozenset({'.pdf', '.docx', '.doc', '.txt', '.md', '.markdown'})
 
 class Tool:
     """Simple tool wrapper to replace langchain.tools.tool"""
@@ -32,13 +39,15 @@ def tool(func):
 
 
 @tool
-def read_file(file_path: Union[str, Path]) -> str:
+def read_file(file_path: Union[str, Path], max_chars: Optional[int] = None) -> str:
     """Read complete document content from a file.
 
     Supports: PDF, Markdown (.md), Text (.txt), Word (.docx)
 
     Args:
         file_path: Path to the document file
+        max_chars: Optional sampling limit; PDFs and large text files then only read
+            what covers the first and last max_chars characters
 
     Returns:
         Complete text content of the document with page/section markers
@@ -51,7 +60,7 @@ def read_file(file_path: Union[str, Path]) -> str:
 
         # PDF files
         if file_path.suffix.lower() == '.pdf':
-            return _read_pdf(file_path)
+            return _read_pdf(file_path, max_chars)
 
         # Word documents
         elif file_path.suffix.lower() in ['.docx', '.doc']:
@@ -59,7 +68,7 @@ def read_file(file_path: Union[str, Path]) -> str:
 
         # Text/Markdown files
         elif file_path.suffix.lower() in ['.txt', '.md', '.markdown']:
-            return _read_text(file_path)
+            return _read_text(file_path, max_chars)
 
         else:
             return f"Error: Unsupported file type: {file_path.suffix}"
@@ -68,37 +77,110 @@ def read_file(file_path: Union[str, Path]) -> str:
         return f"Error reading file {file_path}: {str(e)}"
 
 
-def _read_pdf(file_path: Path) -> str:
-    """Read PDF file using PyMuPDF"""
-    doc = fitz.open(str(file_path))
-    content = []
+def _read_pdf(file_path: Path, max_chars: Optional[int] = None) -> str:
+    """Read PDF file using PyMuPDF.
 
-    for page_num, page in enumerate(doc, 1):
-        text = page.get_text()
-        content.append(f"--- Page {page_num} ---\n{text}")
+    With max_chars, pages are extracted from the front and from the back until
+    each side covers max_chars characters; the middle pages are skipped, so the
+    head and tail of the result match a full read.
+    """
+    with _PDF_LOCK, fitz.open(str(file_path)) as doc:
+        if max_chars is None:
+            content = [f"--- Page {page_num} ---\n{page.get_text()}" for page_num, page in enumerate(doc, 1)]
+        else:
+            pages = {}
+            page_count = doc.page_count
+            for order in (range(page_count), range(page_count - 1, -1, -1)):
+                covered = 0
+                for index in order:
+                    if covered >= max_chars:
+                        break
+                    if index not in pages:
+                        pages[index] = f"--- Page {index + 1} ---\n{doc[index].get_text()}"
+                    covered += len(pages[index])
+            content = [pages[index] for index in sorted(pages)]
 
-    doc.close()
     return "\n\n".join(content)
 
 
 def _read_docx(file_path: Path) -> str:
     """Read Word document"""
     doc = Document(str(file_path))
-    content = []
 
-    for para in doc.paragraphs:
-        if para.text.strip():
-            content.append(para.text)
+    # para.text is rebuilt from the XML on every access, so read it once per paragraph
+    texts = (para.text for para in doc.paragraphs)
+    return "\n\n".join(text for text in texts if text and not text.isspace())
 
-    return "\n\n".join(content)
 
+def _read_text(file_path: Path, max_chars: Optional[int] = None) -> str:
+    """Read plain text or markdown file.
+
+    With max_chars, a large file only has enough bytes for max_chars characters
+    read from each end; the middle is replaced by an ellipsis line.
+    """
+    if max_chars is not None:
+        window = max_chars * 4  # UTF-8 needs at most 4 bytes per character
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > 2 * window:
+                head = f.read(window)
+                f.seek(-window, os.SEEK_END)
+                tail = f.read()
+                return "\n\n...\n\n".join((_decode_text(head), _decode_text(tail)))
 
-def _read_text(file_path: Path) -> str:
-    """Read plain text or markdown file"""
     with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
         return f.read()
 
 
+def _decode_text(data: bytes) -> str:
+    """Decode raw text bytes the way text-mode open() would (universal newlines)"""
+    return data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+
+# Text files are searched in blocks of about this many characters
+_GREP_BLOCK_CHARS = 1 << 20
+
+
+def _iter_blocks(file_path: Path) -> Iterator[str]:
+    """Yield a document's text in blocks, without building the full text.
+
+    Joined with newlines, the blocks give the lines read_file would number:
+    one block per PDF page (with its page marker), the whole DOCX body, or
+    whole lines of a text file up to about _GREP_BLOCK_CHARS per block.
+
+    Args:
+        file_path: Path to the document file
+
+    Yields:
+        Blocks of document text
+    """
+    suffix = file_path.suffix.lower()
+
+    if suffix == '.pdf':
+        with _PDF_LOCK, fitz.open(str(file_path)) as doc:
+            for page_num, page in enumerate(doc, 1):
+                marker = f"--- Page {page_num} ---\n"
+                # Blank line between pages
+                yield marker + page.get_text() if page_num == 1 else "\n" + marker + page.get_text()
+
+    elif suffix in ['.docx', '.doc']:
+        body = _read_docx(file_path)
+        if body:
+            yield body
+
+    elif suffix in ['.txt', '.md', '.markdown']:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                block = f.read(_GREP_BLOCK_CHARS)
+                if not block:
+                    break
+                if not block.endswith('\n'):
+                    block += f.readline()  # Finish the last line
+                yield block[:-1] if block.endswith('\n') else block
+
+    else:
+        raise ValueError(f"Unsupported file type: {file_path.suffix}")
+
+
 @tool
 def grep(pattern: str, file_path: Union[str, Path], context_lines: int = 3) -> str:
     """Search for a pattern in a document and return matching lines with context.
@@ -112,33 +194,52 @@ def grep(pattern: str, file_path: Union[str, Path], context_lines: int = 3) -> s
         Matching lines with context, or empty if no matches found
     """
     try:
-        # First read the file
-        content = read_file(file_path)
-
-        if content.startswith("Error:"):
-            return content
-
-        lines = content.split('\n')
-        matches = []
+        if not Path(file_path).exists():
+            return f"Error: File not found: {file_path}"
 
         # Compile regex pattern
         regex = re.compile(pattern, re.IGNORECASE)
-
-        for i, line in enumerate(lines):
-            if regex.search(line):
-                # Get context
-                start = max(0, i - context_lines)
-                end = min(len(lines), i + context_lines + 1)
-
-                context_block = []
-                for j in range(start, end):
-                    prefix = ">>> " if j == i else "    "
-                    context_block.append(f"{prefix}Line {j+1}: {lines[j]}")
-
-                matches.append("\n".join(context_block))
+        # Block check; MULTILINE lets ^/$ match at the line starts/ends the per-line search sees
+        block_regex = re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+        matches = []  # (matching line number, [(line number, line), ...])
+        before = deque(maxlen=context_lines)  # (line number, line) preceding the current one
+        open_blocks = []  # [context block, lines still to append] awaiting post-context
+        line_num = 0
+
+        # Stream blocks so large documents are never held as one string
+        for block in _iter_blocks(Path(file_path)):
+            if not open_blocks and not block_regex.search(block):
+                # One scan rejects the block; only its last lines can be context later
+                tail = block.rsplit('\n', context_lines)[-context_lines:] if context_lines else []
+                block_lines = block.count('\n') + 1
+                before.extend(enumerate(tail, line_num + block_lines - len(tail) + 1))
+                line_num += block_lines
+                continue
+
+            for line in block.split('\n'):
+                line_num += 1
+
+                for pending in open_blocks:
+                    pending[0].append((line_num, line))
+                    pending[1] -= 1
+                open_blocks = [pending for pending in open_blocks if pending[1] > 0]
+
+                if regex.search(line):
+                    context_block = list(before)
+                    context_block.append((line_num, line))
+                    matches.append((line_num, context_block))
+                    if context_lines > 0:
+                        open_blocks.append([context_block, context_lines])
+
+                before.append((line_num, line))
 
         if matches:
-            return f"Found {len(matches)} match(es) for '{pattern}' in {file_path}:\n\n" + "\n\n---\n\n".join(matches)
+            # Lines are formatted only now, for the blocks that are shown
+            return f"Found {len(matches)} match(es) for '{pattern}' in {file_path}:\n\n" + "\n\n---\n\n".join(
+                "\n".join(f"{'>>> ' if num == match_num else '    '}Line {num}: {line}" for num, line in context_block)
+                for match_num, context_block in matches
+            )
         else:
             return f"No matches found for '{pattern}' in {file_path}"
 
@@ -146,6 +247,71 @@ def grep(pattern: str, file_path: Union[str, Path], context_lines: int = 3) -> s
         return f"Error searching file {file_path}: {str(e)}"
 
 
+def _walk_docs(directory: Union[str, Path], supported_exts: Collection[str] = SUPPORTED_EXTS,
+               skip_names: Collection[str] = ()) -> Iterator[Tuple[Path, os.stat_result]]:
+    """Recursively yield supported documents with their stat results.
+
+    Uses os.scandir so the file type comes from the directory listing and each
+    file is stat'ed once. Visits files in the same order as Path.rglob: a
+    directory's files first, then its subdirectories; symlinked directories
+    are not followed.
+
+    Args:
+        directory: Directory to walk
+        supported_exts: Lowercase extensions to include
+        skip_names: File names to leave out (e.g. the knowledge map itself)
+
+    Yields:
+        (path, stat) for each matching file
+    """
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        # Unreadable directory - skip it like rglob does
+        return
+
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in supported_exts \
+                and entry.name not in skip_names:
+            yield Path(entry.path), entry.stat()
+
+    for subdir in subdirs:
+        yield from _walk_docs(subdir, supported_exts, skip_names)
+
+
+def scan_documents(directory: Union[str, Path] = ".") -> List[Dict]:
+    """Find all supported documents in a directory and its subdirectories.
+
+    Args:
+        directory: Directory path to scan (default: current directory)
+
+    Returns:
+        Document entries (path, name, type, size_kb, modified), newest first
+    """
+    directory = Path(directory)
+
+    documents = []
+
+    # Recursively find documents
+    for file_path, stat in _walk_docs(directory):
+        documents.append({
+            'path': str(file_path.relative_to(directory)),
+            'name': file_path.name,
+            'type': file_path.suffix[1:].upper(),
+            'size_kb': round(stat.st_size / 1024, 2),
+            'modified': stat.st_mtime
+        })
+
+    # Sort by modification time (newest first)
+    documents.sort(key=lambda x: x['modified'], reverse=True)
+
+    return documents
+
+
 @tool
 def list_docs(directory: Union[str, Path] = ".") -> str:
     """List all documents in a directory and its subdirectories.
@@ -162,29 +328,11 @@ def list_docs(directory: Union[str, Path] = ".") -> str:
         if not directory.exists():
             return f"Error: Directory not found: {directory}"
 
-        # Supported file extensions
-        supported_exts = {'.pdf', '.docx', '.doc', '.txt', '.md', '.markdown'}
-
-        documents = []
-
-        # Recursively find documents
-        for file_path in directory.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in supported_exts:
-                stat = file_path.stat()
-                documents.append({
-                    'path': str(file_path.relative_to(directory)),
-                    'name': file_path.name,
-                    'type': file_path.suffix[1:].upper(),
-                    'size_kb': round(stat.st_size / 1024, 2),
-                    'modified': stat.st_mtime
-                })
+        documents = scan_documents(directory)
 
         if not documents:
             return f"No documents found in {directory}"
 
-        # Sort by modification time (newest first)
-        documents.sort(key=lambda x: x['modified'], reverse=True)
-
         # Format output
         output = [f"Found {len(documents)} document(s) in {directory}:\n"]
 
@@ -1,12 +1,122 @@
 """Knowledge map generator for document discovery"""
 
+import hashlib
+import json
 import os
 import re
+import time
 import yaml
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 import ollama
 
+from ..utils.map_cache import load_cached_map, store_cached_map
+
+# libyaml-backed dumper/loader when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
+# Faster parsing of AI JSON replies when orjson is installed (pip install locallm[fast])
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# Reasoning blocks and the JSON object in AI responses
+_THINK_RE = re.compile(r'<(think(?:ing)?)>[\s\S]*?</\1>', re.IGNORECASE)
+_JSON_OBJECT_RE = re.compile(r'\{[\s\S]*?\}')
+_JSON_ARRAY_RE = re.compile(r'\[[\s\S]*\]')
+
+# CJK characters, runs and 4-character phrases
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_CJK_RUN_RE = re.compile(r'[\u4e00-\u9fff]+')
+_CJK4_RE = re.compile(r'[\u4e00-\u9fff]{4}')
+
+# Keyword candidates: capitalized words (joined into phrases in Python so the
+# scan stays linear) and hyphenated/underscored terms
+_CAP_WORD_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_TECH_RE = re.compile(r'\b[A-Za-z]+[-_][A-Za-z0-9]+\b')
+
+# Basic stopwords for fallback keyword extraction (minimal list)
+_KEYWORD_STOPWORDS = frozenset({
+    'The', 'This', 'That', 'These', 'Those', 'And', 'Or', 'But',
+    'Page', 'Figure', 'Table', 'Section', 'Chapter'
+})
+
+# Abstract start and the section markers that end it
+_ABSTRACT_RE = re.compile(r'(?:^|\n)\s*(?:摘要|ABSTRACT|Abstract|執行摘要|Executive Summary)\s*[:：\n]', re.IGNORECASE | re.MULTILINE)
+_ABSTRACT_END_RES = (
+    re.compile(r'(?:^|\n)\s*(?:關鍵詞|Keywords?|Introduction|1\.|I\.)\s*[:：\n]', re.IGNORECASE | re.MULTILINE),
+    re.compile(r'(?:^|\n)\s*(?:一、|第一章)', re.IGNORECASE | re.MULTILINE),
+)
+
+# Table of contents / outline markers
+_TOC_RES = (
+    re.compile(r'(?:目錄|Table of Contents|Contents)\s*[:：\n]', re.IGNORECASE),
+    re.compile(r'(?:大綱|Outline)\s*[:：\n]', re.IGNORECASE),
+)
+
+_WS_RE = re.compile(r'\s+')
+
+# Minimal blacklist for AI-generated concepts - trust the AI for most filtering
+_CONCEPT_BLACKLIST = frozenset({
+    'page', 'figure', 'table', 'section', 'chapter', 'appendix',
+    'reference', 'abstract', 'introduction', 'conclusion',
+    'university', 'department', 'institute'
+})
+
+# Valid concept: 2+ chars, not a blacklisted word, no '@' (email addresses)
+_VALID_CONCEPT_RE = re.compile(
+    r'(?!(?:%s)\Z)[^@]{2,}' % '|'.join(map(re.escape, sorted(_CONCEPT_BLACKLIST))),
+    re.IGNORECASE
+)
+
+# Documents analyzed at once; overlaps file reads with Ollama inference
+MAP_WORKERS = 4
+
+# Fast-mode sample: first 60% and last 40% of up to 8000 chars
+_MAX_SAMPLE_CHARS = 8000
+_HEAD_SIZE = int(_MAX_SAMPLE_CHARS * 0.6)
+_TAIL_SIZE = _MAX_SAMPLE_CHARS - _HEAD_SIZE
+_SEP = "\n\n...\n\n"
+
+# Full-mode cap for the AI (~8000 tokens), split the same way
+_AI_MAX_CHARS = 32000
+_AI_HEAD_SIZE = int(_AI_MAX_CHARS * 0.6)
+_AI_TAIL_SIZE = _AI_MAX_CHARS - _AI_HEAD_SIZE
+_AI_SEP = "\n\n[... middle content truncated ...]\n\n"
+
+# Keep the model loaded for 10 minutes after each request (server default: 5),
+# so slow documents and back-to-back rebuilds skip the model reload
+_KEEP_ALIVE = '10m'
+
+# Seconds an analysis request may take before it falls back; also bounds how
+# long interpreter exit waits for worker threads after Ctrl+C
+AI_TIMEOUT = 120
+
+# Client shared by all map-generation requests (honors OLLAMA_HOST like the module-level API)
+_client = ollama.Client(timeout=AI_TIMEOUT)
+
+# Minimum seconds between progress description updates
+STATUS_INTERVAL = 0.5
+
+# AI analyses keyed by a hash of the analyzed text, so duplicate documents (copies
+# under other paths) reuse one result; persisted beside the map between builds
+_analysis_memo: Dict[str, list] = {}
+_analysis_memo_used: Dict[str, list] = {}  # Entries hit or stored by the current build
+
+# Placeholder for documents still being analyzed
+_PENDING = object()
+
+# Fast mode sends up to this many TOC/abstract excerpts per AI request,
+# as long as they fit the character budget
+AI_BATCH_SIZE = 4
+_BATCH_CHAR_BUDGET = 4000
+
 
 def generate_knowledge_map(directory: Union[str, Path] = ".", output_file: str = "knowledge_map.yaml", use_ai: bool = True, fast_mode: bool = False) -> str:
     """Generate a knowledge map for all documents in directory.
@@ -20,7 +130,7 @@ def generate_knowledge_map(directory: Union[str, Path] = ".", output_file: str =
     Returns:
         Status message
     """
-    from .file_ops import list_docs, read_file
+    from .file_ops import _walk_docs
     from rich.console import Console
     from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn, TimeRemainingColumn
 
@@ -28,41 +138,87 @@ def generate_knowledge_map(directory: Union[str, Path] = ".", output_file: str =
     directory = Path(directory)
     output_path = directory / output_file
 
-    # Get list of documents
-    docs_list = list_docs.invoke(str(directory))
-
-    if docs_list.startswith("Error:") or "No documents found" in docs_list:
-        return docs_list
-
-    # Parse document paths from list_docs output
-    document_entries = []
-
-    # Find all supported documents
-    supported_exts = {'.pdf', '.docx', '.doc', '.txt', '.md', '.markdown'}
+    if not directory.exists():
+        return f"Error: Directory not found: {directory}"
 
-    # First, collect all files to process
-    files_to_process = []
-    for file_path in directory.rglob('*'):
-        if file_path.is_file() and file_path.suffix.lower() in supported_exts:
-            if file_path.name != output_file:
-                files_to_process.append(file_path)
+    # Collect all files to process with their stat results
+    files_to_process = list(_walk_docs(directory, skip_names={output_file}))
 
     total_files = len(files_to_process)
     if total_files == 0:
-        return "No documents found to process."
+        return f"No documents found in {directory}"
+
+    # Entries are streamed here and moved over the map once the build completes
+    partial_path = output_path.with_name(output_path.name + '.partial')
+    memo_path = directory / f".{Path(output_file).stem}_cache.json"
+
+    # Reuse entries of unchanged files from a previous map built in the same mode,
+    # including the part an interrupted build already wrote
+    mode = 'fast' if fast_mode else 'full'
+    cached_entries = {}
+    for previous_path in (output_path, partial_path):
+        try:
+            previous_map = yaml.load(previous_path.read_bytes(), Loader=_YamlLoader)
+        except Exception:
+            continue  # Missing or unreadable (e.g. cut off mid-entry) - analyze again
+        if isinstance(previous_map, dict) and previous_map.get('mode') == mode:
+            cached_entries.update((entry.get('path'), entry) for entry in previous_map.get('documents') or [])
+
+    # Only successful AI analyses are memoized, so an entry whose description is
+    # not in the memo came from a fallback (e.g. Ollama was down) and is analyzed again
+    _load_analysis_memo(memo_path)
+    analyzed = {value[0] for value in _analysis_memo.values()}
+
+    results = [_PENDING] * total_files
+    to_analyze = []
+    for index, (file_path, stat) in enumerate(files_to_process):
+        old = cached_entries.get(str(file_path.relative_to(directory)))
+        if old and old.get('last_updated') == stat.st_mtime and old.get('size_kb') == round(stat.st_size / 1024, 2) \
+                and old.get('description') in analyzed:
+            results[index] = {key: value for key, value in old.items() if key != 'id'}
+        else:
+            to_analyze.append(index)
+    reused = total_files - len(to_analyze)
 
     # Show initial info
     console.print(f"[cyan]📚 Found {total_files} document(s)[/cyan]")
+    if reused:
+        console.print(f"[dim]Reusing {reused} unchanged document(s) from the existing map[/dim]")
     if fast_mode:
-        estimated_time = total_files * 2  # Roughly 2 seconds per file with TOC/abstract
+        estimated_time = len(to_analyze) * 2  # Roughly 2 seconds per file with TOC/abstract
         console.print(f"[dim]Estimated time: ~{estimated_time} seconds (AI reads TOC/abstract)[/dim]")
     else:
-        estimated_time = total_files * 5  # Roughly 5 seconds per file with full content
+        estimated_time = len(to_analyze) * 5  # Roughly 5 seconds per file with full content
         console.print(f"[dim]Estimated time: ~{estimated_time} seconds (AI reads full content)[/dim]")
     console.print()
 
-    # Process files with progress bar
-    with Progress(
+    # Reused entries never reach _memo_get; keep their analyses for the next build
+    _memo_retain({entry.get('description') for entry in results if entry is not _PENDING})
+
+    written = 0
+    next_index = 0
+
+    def write_ready(f):
+        """Append finished entries that have no pending document before them"""
+        nonlocal written, next_index
+        ready = []
+        while next_index < total_files and results[next_index] is not _PENDING:
+            entry = results[next_index]
+            results[next_index] = None  # Written entries need not stay in memory
+            next_index += 1
+            # Number documents in walk order, skipping files that produced no entry
+            if entry is not None:
+                ready.append({'id': f"doc_{written:03d}", **entry})
+                written += 1
+        if ready:
+            if written == len(ready):
+                f.write("documents:\n")
+            yaml.dump(ready, f, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False, default_flow_style=False)
+            f.flush()
+            os.fsync(f.fileno())
+
+    # Process files with progress bar, streaming entries to the partial map
+    with open(partial_path, 'w', encoding='utf-8') as f, Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
@@ -71,110 +227,257 @@ def generate_knowledge_map(directory: Union[str, Path] = ".", output_file: str =
         console=console,
         refresh_per_second=10  # Higher refresh rate for smooth spinner animation
     ) as progress:
-        task = progress.add_task(f"[cyan]Building knowledge map", total=total_files)
+        task = progress.add_task(f"[cyan]Building knowledge map", total=total_files, completed=reused)
+
+        last_status = 0.0
+
+        def set_status(description: str):
+            # Workers report several steps per document; show at most one every STATUS_INTERVAL
+            nonlocal last_status
+            now = time.monotonic()
+            if now - last_status >= STATUS_INTERVAL:
+                last_status = now
+                progress.update(task, description=description)
+
+        header = {'version': '1.0', 'directory': str(directory.absolute()), 'mode': mode}
+        yaml.dump(header, f, Dumper=_YamlDumper, allow_unicode=True, sort_keys=False, default_flow_style=False)
+        write_ready(f)
+
+        # Fast mode groups documents so one AI request covers several excerpts;
+        # full mode sends each document on its own
+        group_size = AI_BATCH_SIZE if fast_mode else 1
+        groups = [to_analyze[start:start + group_size] for start in range(0, len(to_analyze), group_size)]
+
+        # Analyze groups concurrently; results are slotted back by index so
+        # the map keeps the directory walk order
+        executor = ThreadPoolExecutor(max_workers=MAP_WORKERS)
+        futures = {}
+        try:
+            futures = {
+                executor.submit(
+                    _process_documents,
+                    [(*files_to_process[index], f"{index + 1}/{total_files}") for index in group],
+                    directory, fast_mode, console, set_status
+                ): group
+                for group in groups
+            }
+            for future in as_completed(futures):
+                group = futures[future]
+                for index, entry in zip(group, future.result()):
+                    results[index] = entry
+                write_ready(f)
+                progress.advance(task, len(group))
+        except BaseException:
+            # Ctrl+C or an error: keep finished analyses, drop queued documents and
+            # return without waiting for requests in flight (their results are discarded)
+            _save_analysis_memo(memo_path)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            raise
+        executor.shutdown()
+        _save_analysis_memo(memo_path)
+
+        if written == 0:
+            f.write("documents: []\n")
+        f.write(f"total_documents: {written}\n")
+
+    os.replace(partial_path, output_path)
+
+    # Show completion summary
+    console.print()
+    console.print(f"[bold green]✓ Knowledge map completed![/bold green]")
+    console.print(f"[dim]Location: {output_path}[/dim]")
+    console.print(f"[dim]Processed {written} document(s)[/dim]")
 
-        for idx, file_path in enumerate(files_to_process, 1):
-            # Only update description every file or every 2 seconds to reduce flicker
-            progress.update(task, description=f"[cyan]{idx}/{total_files}: {file_path.name[:30]}")
+    return f"✓ Knowledge map created ({written} documents)"
 
-            # Read file content - only first 3000 chars for speed
-            content = read_file.invoke(str(file_path))
 
-            # Skip files with errors or empty content
-            if content.startswith("Error:"):
-                console.print(f"  [yellow]⚠ Skipped (read error): {file_path.name}[/yellow]")
-                progress.advance(task)
-                continue
+def _process_documents(items: List[tuple], directory: Path, fast_mode: bool, console, status) -> List[Optional[Dict]]:
+    """Read a group of documents and build their knowledge map entries.
 
-            if not content or len(content.strip()) == 0:
-                console.print(f"  [yellow]⚠ Skipped (empty file): {file_path.name}[/yellow]")
-                progress.advance(task)
-                continue
+    Runs on a worker thread, so it reports progress through the status callback.
+    In fast mode the group's TOC/abstract excerpts are analyzed in one AI request.
 
-            # Smart sampling: take first 60% and last 40% (up to 8000 chars total)
-            # This captures intro/TOC and conclusions/summary sections
-            max_chars = 8000
-            if len(content) <= max_chars:
-                content_sample = content
-            else:
-                head_size = int(max_chars * 0.6)
-                tail_size = max_chars - head_size
-                content_sample = content[:head_size] + "\n\n...\n\n" + content[-tail_size:]
+    Args:
+        items: (file_path, stat, label) per document; label is the position shown
+            in progress messages (e.g. "3/10")
+        directory: Root directory of the knowledge map
+        fast_mode: If True, AI reads TOC/abstract only; otherwise the full content
+        console: Rich console for warnings
+        status: Callback receiving progress descriptions
+
+    Returns:
+        Entry without 'id' per item, or None where the file was skipped
+    """
+    from .file_ops import read_file
 
-            # Generate description and key concepts using AI
-            if fast_mode:
-                # Fast mode: Extract TOC/abstract, then let AI quickly summarize
-                progress.update(task, description=f"[cyan]{idx}/{total_files}: AI + TOC {file_path.name[:20]}...")
+    # Read every document first; skipped files keep a None entry
+    docs = []  # (position, file_path, stat, label, content)
+    for position, (file_path, stat, label) in enumerate(items):
+        status(f"[cyan]{label}: {file_path.name[:30]}")
 
-                toc_or_abstract = _extract_toc_or_abstract(content_sample)
+        # Fast mode only samples the head and tail, so long PDFs skip their middle pages
+        content = read_file.invoke(str(file_path), max_chars=_MAX_SAMPLE_CHARS if fast_mode else None)
 
-                # If TOC/abstract not found, use first 2000 chars as summary
-                if not toc_or_abstract or len(toc_or_abstract) < 100:
-                    toc_or_abstract = content_sample[:2000]
+        # Skip files with errors or empty content
+        if content.startswith("Error:"):
+            console.print(f"  [yellow]⚠ Skipped (read error): {file_path.name}[/yellow]")
+            continue
 
-                # AI quickly generates map from extracted summary
-                description, key_concepts = _ai_analyze_toc(
-                    title=file_path.stem,
-                    toc_or_abstract=toc_or_abstract,
-                    file_type=file_path.suffix[1:].upper()
-                )
-            else:
-                # Full mode: Let AI read entire document and decide everything
-                progress.update(task, description=f"[yellow]{idx}/{total_files}: AI full read {file_path.name[:20]}...")
+        if not content or len(content.strip()) == 0:
+            console.print(f"  [yellow]⚠ Skipped (empty file): {file_path.name}[/yellow]")
+            continue
+
+        docs.append((position, file_path, stat, label, content))
 
-                # AI-driven: trust the model to analyze the document completely
-                description, key_concepts = _ai_analyze_document(
+    # Generate description and key concepts using AI
+    if fast_mode:
+        # Fast mode: Extract TOC/abstract, then let AI quickly summarize
+        excerpts = []
+        for _, file_path, _, _, content in docs:
+            # Smart sampling: take first 60% and last 40% (up to 8000 chars total)
+            # This captures intro/TOC and conclusions/summary sections
+            if len(content) <= _MAX_SAMPLE_CHARS:
+                content_sample = content
+            else:
+                content_sample = "".join((content[:_HEAD_SIZE], _SEP, content[-_TAIL_SIZE:]))
+
+            toc_or_abstract = _extract_toc_or_abstract(content_sample)
+
+            # If TOC/abstract not found, use first 2000 chars as summary
+            if not toc_or_abstract or len(toc_or_abstract) < 100:
+                toc_or_abstract = content_sample[:2000]
+
+            excerpts.append((file_path.stem, toc_or_abstract, file_path.suffix[1:].upper()))
+
+        # Excerpts analyzed before (e.g. a copy of another document) skip the AI
+        analyses = [_memo_get(_analysis_key('toc', toc_or_abstract, file_type))
+                    for _, toc_or_abstract, file_type in excerpts]
+        misses = [i for i, analysis in enumerate(analyses) if analysis is None]
+
+        # Pack the remaining excerpts into requests within the character budget
+        start = 0
+        while start < len(misses):
+            end = start + 1
+            budget = len(excerpts[misses[start]][1])
+            while end < len(misses) and budget + len(excerpts[misses[end]][1]) <= _BATCH_CHAR_BUDGET:
+                budget += len(excerpts[misses[end]][1])
+                end += 1
+
+            _, file_path, _, label, _ = docs[misses[start]]
+            status(f"[cyan]{label}: AI + TOC {file_path.name[:20]}...")
+
+            batch_excerpts = [excerpts[i] for i in misses[start:end]]
+            batch = _ai_analyze_toc_batch(batch_excerpts) if end - start > 1 else None
+            if batch is None:
+                # Single document, or the batched reply was unusable
+                batch = [
+                    _ai_analyze_toc(title=title, toc_or_abstract=toc_or_abstract, file_type=file_type)
+                    for title, toc_or_abstract, file_type in batch_excerpts
+                ]
+            for i, analysis in zip(misses[start:end], batch):
+                analyses[i] = analysis
+            start = end
+    else:
+        # Full mode: Let AI read entire document and decide everything
+        analyses = []
+        for _, file_path, _, label, content in docs:
+            status(f"[yellow]{label}: AI full read {file_path.name[:20]}...")
+
+            # AI-driven: trust the model to analyze the document completely
+            analysis = _memo_get(_analysis_key('full', content, file_path.suffix[1:].upper()))
+            if analysis is None:
+                analysis = _ai_analyze_document(
                     title=file_path.name,
                     content=content,  # Full content (all formats: PDF/DOCX/TXT/MD)
                     file_type=file_path.suffix[1:].upper()
                 )
+            analyses.append(analysis)
+
+    entries = [None] * len(items)
+    for (position, file_path, stat, _, _), (description, key_concepts) in zip(docs, analyses):
+        # Ensure key_concepts is never empty
+        if not key_concepts or len(key_concepts) == 0:
+            # Fallback: use filename
+            is_chinese = _CJK_RE.search(file_path.stem)
+            if is_chinese:
+                filename_words = _CJK_RUN_RE.findall(file_path.stem)
+                key_concepts = filename_words[:3] if filename_words else [f"{file_path.suffix[1:].upper()} document"]
+            else:
+                key_concepts = [file_path.stem]
+            console.print(f"  [yellow]⚠ Using filename as keywords: {file_path.name}[/yellow]")
 
-            # Ensure key_concepts is never empty
-            if not key_concepts or len(key_concepts) == 0:
-                # Fallback: use filename
-                is_chinese = re.search(r'[\u4e00-\u9fff]', file_path.stem)
-                if is_chinese:
-                    filename_words = re.findall(r'[\u4e00-\u9fff]+', file_path.stem)
-                    key_concepts = filename_words[:3] if filename_words else [f"{file_path.suffix[1:].upper()} document"]
-                else:
-                    key_concepts = [file_path.stem]
-                console.print(f"  [yellow]⚠ Using filename as keywords: {file_path.name}[/yellow]")
-
-            # Get file metadata
-            stat = file_path.stat()
-
-            document_entries.append({
-                'id': f"doc_{len(document_entries):03d}",
-                'title': file_path.stem,
-                'path': str(file_path.relative_to(directory)),
-                'file_type': file_path.suffix[1:],
-                'size_kb': round(stat.st_size / 1024, 2),
-                'description': description,
-                'key_concepts': key_concepts,
-                'last_updated': stat.st_mtime
-            })
-
-            progress.advance(task)
-
-    # Create knowledge map structure
-    knowledge_map = {
-        'version': '1.0',
-        'directory': str(directory.absolute()),
-        'total_documents': len(document_entries),
-        'documents': document_entries
-    }
-
-    # Save to YAML
-    with open(output_path, 'w', encoding='utf-8') as f:
-        yaml.dump(knowledge_map, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+        entries[position] = {
+            'title': file_path.stem,
+            'path': str(file_path.relative_to(directory)),
+            'file_type': file_path.suffix[1:],
+            'size_kb': round(stat.st_size / 1024, 2),
+            'description': description,
+            'key_concepts': key_concepts,
+            'last_updated': stat.st_mtime
+        }
+
+    return entries
+
+
+def _analysis_key(kind: str, text: str, file_type: str) -> str:
+    """Hash the AI input that determines an analysis.
+
+    Args:
+        kind: 'toc' for fast-mode excerpts, 'full' for whole documents
+        text: Text sent to the AI
+        file_type: File extension (PDF, DOCX, etc.)
+
+    Returns:
+        Hex digest used as the memo key
+    """
+    data = "\0".join((kind, file_type, text)).encode('utf-8', 'ignore')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _memo_get(key: str) -> Optional[tuple]:
+    """Get a memoized (description, key_concepts) analysis, or None"""
+    value = _analysis_memo.get(key)
+    if value is None:
+        return None
+    _analysis_memo_used[key] = value
+    return value[0], list(value[1])
 
-    # Show completion summary
-    console.print()
-    console.print(f"[bold green]✓ Knowledge map completed![/bold green]")
-    console.print(f"[dim]Location: {output_path}[/dim]")
-    console.print(f"[dim]Processed {len(document_entries)} document(s)[/dim]")
 
-    return f"✓ Knowledge map created ({len(document_entries)} documents)"
+def _memo_put(key: str, description: str, key_concepts: List[str]):
+    """Memoize a successful AI analysis"""
+    _analysis_memo[key] = _analysis_memo_used[key] = [description, list(key_concepts)]
+
+
+def _memo_retain(descriptions: set):
+    """Mark memoized analyses still referenced by reused map entries as used"""
+    for key, value in _analysis_memo.items():
+        if value[0] in descriptions:
+            _analysis_memo_used[key] = value
+
+
+def _load_analysis_memo(memo_path: Path):
+    """Start a build with the analyses saved by the previous one"""
+    _analysis_memo.clear()
+    _analysis_memo_used.clear()
+    try:
+        data = _json_loads(memo_path.read_bytes())
+    except (OSError, ValueError):
+        return  # No memo yet, or unreadable - analyze again
+    if isinstance(data, dict):
+        _analysis_memo.update(data)
+
+
+def _save_analysis_memo(memo_path: Path):
+    """Save the analyses used by this build (stale ones are dropped)"""
+    tmp_path = memo_path.with_name(memo_path.name + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_analysis_memo_used, f, ensure_ascii=False)
+        os.replace(tmp_path, memo_path)
+    except OSError:
+        pass  # Memo is best effort
 
 
 def _ai_analyze_document(title: str, content: str, file_type: str) -> tuple:
@@ -191,19 +494,12 @@ def _ai_analyze_document(title: str, content: str, file_type: str) -> tuple:
     Returns:
         (description, key_concepts) tuple
     """
-    import json
-    import re
-
     # Let AI read as much as possible without artificial limits
     # Only truncate if exceeding model context window (most models: 8k-32k tokens)
-    max_chars = 32000  # ~8000 tokens, enough for most documents
-
-    if len(content) > max_chars:
+    if len(content) > _AI_MAX_CHARS:
         # Smart sampling: prioritize beginning (intro/TOC) and end (conclusion)
         # but let AI see more context
-        head = int(max_chars * 0.6)
-        tail = max_chars - head
-        content_for_ai = content[:head] + "\n\n[... middle content truncated ...]\n\n" + content[-tail:]
+        content_for_ai = "".join((content[:_AI_HEAD_SIZE], _AI_SEP, content[-_AI_TAIL_SIZE:]))
     else:
         content_for_ai = content
 
@@ -235,7 +531,7 @@ You are free to analyze this document in any way you see fit. No strict rules.
 JSON:"""
 
     try:
-        response = ollama.generate(
+        response = _client.generate(
             model='qwen3:latest',
             prompt=prompt,
             options={
@@ -243,22 +539,20 @@ JSON:"""
                 'num_predict': 2000,  # Allow longer responses
                 'num_ctx': 16384     # Large context window for full documents
             },
-            stream=False
+            stream=False,
+            keep_alive=_KEEP_ALIVE
         )
 
         result = response['response'].strip()
 
         # Clean think tags
-        result = re.sub(r'<think>[\s\S]*?</think>', '', result, flags=re.IGNORECASE)
-        result = re.sub(r'<thinking>[\s\S]*?</thinking>', '', result, flags=re.IGNORECASE)
-        result = re.sub(r'<think>\s*', '', result, flags=re.IGNORECASE)
-        result = result.strip()
+        result = _THINK_RE.sub('', result).strip()
 
         # Try to extract JSON
-        json_match = re.search(r'\{[\s\S]*?\}', result)
+        json_match = _JSON_OBJECT_RE.search(result)
         if json_match:
             try:
-                data = json.loads(json_match.group())
+                data = _json_loads(json_match.group())
                 description = data.get('description', '').strip()
                 key_concepts = data.get('key_concepts', [])
 
@@ -268,6 +562,7 @@ JSON:"""
 
                 # Validate description quality
                 if description and len(description) >= 100:
+                    _memo_put(_analysis_key('full', content, file_type), description, key_concepts or [])
                     return description, key_concepts if key_concepts else []
                 else:
                     # Description too short or empty, try fallback extraction
@@ -276,7 +571,7 @@ JSON:"""
                     console.print(f"  [yellow]⚠ AI description too short for {title[:30]}, using fallback[/yellow]")
                     return _fallback_analysis(title, content_for_ai, file_type)
 
-            except json.JSONDecodeError:
+            except ValueError:  # json and orjson decode errors are both ValueErrors
                 # JSON parsing failed, use fallback
                 from rich.console import Console
                 console = Console()
@@ -323,34 +618,46 @@ def _extract_key_concepts(content: str, max_concepts: int = 10) -> List[str]:
 
     This is only used when AI fails. Extracts capitalized words and technical terms.
     """
-    import re
-    from collections import Counter
+    window = content[:5000]
 
-    # Basic stopwords (minimal list)
-    stopwords = {
-        'The', 'This', 'That', 'These', 'Those', 'And', 'Or', 'But',
-        'Page', 'Figure', 'Table', 'Section', 'Chapter'
-    }
+    # Tally capitalized words and technical terms in one pass each
+    counts = Counter(_capitalized_phrases(window))
+    counts.update(_TECH_RE.findall(window))
 
-    # Find capitalized words and technical terms
-    capitalized = re.findall(r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b', content[:5000])
-    technical = re.findall(r'\b[A-Za-z]+[-_][A-Za-z0-9]+\b', content[:5000])
+    # For Chinese: add 4-char phrases that appear frequently
+    if _CJK_RE.search(window):
+        phrase_counts = Counter(_CJK4_RE.findall(window))
+        for phrase, count in phrase_counts.most_common(10):
+            if count >= 3:
+                counts[phrase] += count
 
-    # For Chinese: extract 4-char phrases that appear frequently
-    chinese_phrases = []
-    if re.search(r'[\u4e00-\u9fff]', content):
-        four_char = re.findall(r'[\u4e00-\u9fff]{4}', content[:5000])
-        phrase_counts = Counter(four_char)
-        chinese_phrases = [p for p, c in phrase_counts.most_common(10) if c >= 3]
+    # Most frequent first, then filter
+    ranked = [c for c, _ in counts.most_common() if c not in _KEYWORD_STOPWORDS and len(c) > 2]
 
-    # Combine and filter
-    all_candidates = capitalized + technical + chinese_phrases
-    filtered = [c for c in set(all_candidates) if c not in stopwords and len(c) > 2]
+    return ranked[:max_concepts]
 
-    # Sort by frequency
-    filtered.sort(key=lambda x: content.count(x), reverse=True)
 
-    return filtered[:max_concepts]
+def _capitalized_phrases(text: str) -> List[str]:
+    """Find runs of capitalized words separated only by whitespace (e.g. "Deep Learning").
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        Capitalized phrases in order of appearance
+    """
+    phrases = []
+    start = end = -1
+    for match in _CAP_WORD_RE.finditer(text):
+        if end >= 0 and match.start() > end and text[end:match.start()].isspace():
+            end = match.end()  # Extend the current phrase
+            continue
+        if end >= 0:
+            phrases.append(text[start:end])
+        start, end = match.span()
+    if end >= 0:
+        phrases.append(text[start:end])
+    return phrases
 
 
 def _extract_toc_or_abstract(content: str, max_chars: int = 2000) -> str:
@@ -365,8 +672,6 @@ def _extract_toc_or_abstract(content: str, max_chars: int = 2000) -> str:
     Returns:
         Extracted TOC/abstract text, or empty string if not found
     """
-    import re
-
     # Try abstract first (usually more informative than TOC)
     abstract = _extract_abstract(content, max_chars)
     if abstract:
@@ -390,31 +695,20 @@ def _extract_abstract(content: str, max_chars: int = 2000) -> str:
     Returns:
         Abstract text, or empty string if not found
     """
-    import re
-
-    abstract_patterns = [
-        r'(?:^|\n)\s*(?:摘要|ABSTRACT|Abstract|執行摘要|Executive Summary)\s*[:：\n]',
-    ]
-
-    for pattern in abstract_patterns:
-        match = re.search(pattern, content, re.IGNORECASE | re.MULTILINE)
-        if match:
-            abstract_start = match.end()
-            # Extract until next section
-            section_end_markers = [
-                r'(?:^|\n)\s*(?:關鍵詞|Keywords?|Introduction|1\.|I\.)\s*[:：\n]',
-                r'(?:^|\n)\s*(?:一、|第一章)',
-            ]
-            abstract_end = abstract_start + max_chars
-            for end_pattern in section_end_markers:
-                end_match = re.search(end_pattern, content[abstract_start:], re.IGNORECASE | re.MULTILINE)
-                if end_match and end_match.start() < max_chars:
-                    abstract_end = abstract_start + end_match.start()
-                    break
-
-            abstract_text = content[abstract_start:abstract_end].strip()
-            if len(abstract_text) > 50:  # Valid abstract
-                return abstract_text
+    match = _ABSTRACT_RE.search(content)
+    if match:
+        abstract_start = match.end()
+        # Extract until next section
+        abstract_end = abstract_start + max_chars
+        for end_re in _ABSTRACT_END_RES:
+            end_match = end_re.search(content[abstract_start:])
+            if end_match and end_match.start() < max_chars:
+                abstract_end = abstract_start + end_match.start()
+                break
+
+        abstract_text = content[abstract_start:abstract_end].strip()
+        if len(abstract_text) > 50:  # Valid abstract
+            return abstract_text
 
     return ""
 
@@ -430,9 +724,6 @@ def _ai_analyze_toc(title: str, toc_or_abstract: str, file_type: str) -> tuple:
     Returns:
         (description, key_concepts) tuple
     """
-    import json
-    import re
-
     prompt = f"""Based on this document's table of contents or abstract, create a brief knowledge map entry.
 
 **Document**: {title}
@@ -450,7 +741,7 @@ Write a concise 150-200 word description and extract 5-10 keywords.
 JSON:"""
 
     try:
-        response = ollama.generate(
+        response = _client.generate(
             model='qwen3:latest',
             prompt=prompt,
             options={
@@ -458,24 +749,25 @@ JSON:"""
                 'num_predict': 800,
                 'num_ctx': 4096
             },
-            stream=False
+            stream=False,
+            keep_alive=_KEEP_ALIVE
         )
 
         result = response['response'].strip()
-        result = re.sub(r'<think>[\s\S]*?</think>', '', result, flags=re.IGNORECASE)
-        result = re.sub(r'<thinking>[\s\S]*?</thinking>', '', result, flags=re.IGNORECASE)
-        result = result.strip()
+        result = _THINK_RE.sub('', result).strip()
 
-        json_match = re.search(r'\{[\s\S]*?\}', result)
+        json_match = _JSON_OBJECT_RE.search(result)
         if json_match:
-            data = json.loads(json_match.group())
+            data = _json_loads(json_match.group())
             description = data.get('description', '').strip()
             key_concepts = data.get('key_concepts', [])
 
             if key_concepts:
                 key_concepts = _filter_invalid_concepts(key_concepts)
 
-            if not description:
+            if description:
+                _memo_put(_analysis_key('toc', toc_or_abstract, file_type), description, key_concepts or [])
+            else:
                 description = f"Document: {title}"
             if not key_concepts:
                 key_concepts = []
@@ -488,27 +780,90 @@ JSON:"""
         return f"Document: {title}", []
 
 
+def _ai_analyze_toc_batch(documents: List[tuple]) -> Optional[List[tuple]]:
+    """Let AI analyze several TOC/abstract excerpts in one request (fast mode).
+
+    Args:
+        documents: (title, toc_or_abstract, file_type) per document
+
+    Returns:
+        (description, key_concepts) tuple per document in the same order,
+        or None if the reply cannot be matched to the documents
+    """
+    sections = "\n\n".join(
+        f"[{number}] **Document**: {title}\n**Format**: {file_type}\n**TOC/Abstract**:\n{toc_or_abstract}"
+        for number, (title, toc_or_abstract, file_type) in enumerate(documents, 1)
+    )
+
+    prompt = f"""Based on each document's table of contents or abstract, create a brief knowledge map entry per document.
+
+{sections}
+
+**Instructions**:
+For each document, write a concise 150-200 word description and extract 5-10 keywords.
+
+**Output** (JSON array only, one object per document, in the order above):
+[{{"description": "...", "key_concepts": ["...", "..."]}}]
+
+JSON:"""
+
+    try:
+        response = _client.generate(
+            model='qwen3:latest',
+            prompt=prompt,
+            options={
+                'temperature': 0.3,
+                'num_predict': 800 * len(documents),
+                'num_ctx': 8192
+            },
+            stream=False,
+            keep_alive=_KEEP_ALIVE
+        )
+
+        result = response['response'].strip()
+        result = _THINK_RE.sub('', result).strip()
+
+        json_match = _JSON_ARRAY_RE.search(result)
+        if not json_match:
+            return None
+
+        data = _json_loads(json_match.group())
+        if not isinstance(data, list) or len(data) != len(documents) or not all(isinstance(item, dict) for item in data):
+            return None
+
+        analyses = []
+        for (title, toc_or_abstract, file_type), item in zip(documents, data):
+            description = str(item.get('description') or '').strip()
+            key_concepts = item.get('key_concepts') or []
+            if key_concepts:
+                key_concepts = _filter_invalid_concepts(key_concepts)
+            if description:
+                _memo_put(_analysis_key('toc', toc_or_abstract, file_type), description, key_concepts)
+            else:
+                description = f"Document: {title}"
+            analyses.append((description, key_concepts))
+
+        return analyses
+
+    except Exception:
+        return None
+
+
 def _extract_toc(content: str, max_chars: int = 2000) -> str:
     """Simple TOC extraction: look for common markers.
 
     Returns TOC text if found, empty string otherwise.
     """
-    import re
-
     # Look for TOC markers
-    toc_markers = [
-        r'(?:目錄|Table of Contents|Contents)\s*[:：\n]',
-        r'(?:大綱|Outline)\s*[:：\n]',
-    ]
-
-    for pattern in toc_markers:
-        match = re.search(pattern, content[:3000], re.IGNORECASE)
+    head = content[:3000]
+    for toc_re in _TOC_RES:
+        match = toc_re.search(head)
         if match:
             # Extract next max_chars after marker
             start = match.end()
             toc = content[start:start + max_chars]
             # Clean up
-            toc = re.sub(r'\s+', ' ', toc)
+            toc = _WS_RE.sub(' ', toc)
             return toc.strip() if len(toc.strip()) > 50 else ""
 
     return ""
@@ -519,15 +874,12 @@ def _extract_introduction(content: str, max_chars: int = 300) -> str:
 
     Returns first N characters, skipping title page if detected.
     """
-    import re
-
     # Skip first 200 chars if looks like title page
     start = 200 if len(content) > 500 else 0
 
-    # Clean and extract
+    # Clean and extract; collapsing all whitespace also removes newlines
     text = content[start:start + max_chars * 2]
-    text = re.sub(r'\n+', ' ', text)  # Remove newlines
-    text = re.sub(r'\s+', ' ', text)  # Remove extra spaces
+    text = _WS_RE.sub(' ', text)
 
     return text[:max_chars].strip() + '...' if len(text) > max_chars else text.strip()
 
@@ -537,28 +889,8 @@ def _filter_invalid_concepts(concepts: List[str]) -> List[str]:
 
     Trust AI to extract good keywords, only filter obvious issues.
     """
-    # Minimal blacklist - trust the AI for most filtering
-    blacklist = {
-        'page', 'figure', 'table', 'section', 'chapter', 'appendix',
-        'reference', 'abstract', 'introduction', 'conclusion',
-        'university', 'department', 'institute'
-    }
-
-    filtered = []
-    for concept in concepts:
-        concept_lower = concept.lower().strip()
-
-        # Basic checks
-        if len(concept_lower) < 2:
-            continue
-        if concept_lower in blacklist:
-            continue
-        if '@' in concept_lower:  # Email addresses
-            continue
-
-        filtered.append(concept)
-
-    return filtered
+    # Drop too-short terms, structural words and email addresses in one match
+    return [concept for concept in concepts if _VALID_CONCEPT_RE.fullmatch(concept.strip())]
 
 
 def load_knowledge_map(directory: Union[str, Path] = ".", map_file: str = "knowledge_map.yaml") -> Optional[Dict]:
@@ -571,10 +903,34 @@ def load_knowledge_map(directory: Union[str, Path] = ".", map_file: str = "knowl
     Returns:
         Knowledge map dictionary, or None if not found
     """
+    return read_knowledge_map(directory, map_file)[0]
+
+
+def read_knowledge_map(directory: Union[str, Path] = ".",
+                       map_file: str = "knowledge_map.yaml") -> Tuple[Optional[Dict], Optional[bytes]]:
+    """Load the knowledge map together with the raw file it was parsed from.
+
+    Callers that embed the YAML (e.g. in a prompt) use these bytes, so the
+    text always matches the parsed map even if the file is rebuilt later.
+
+    Args:
+        directory: Directory containing the map
+        map_file: Map file name
+
+    Returns:
+        (knowledge map dictionary, raw YAML bytes), or (None, None) if not found
+    """
     map_path = Path(directory) / map_file
 
-    if not map_path.exists():
-        return None
+    try:
+        data = map_path.read_bytes()
+    except FileNotFoundError:
+        return None, None
+
+    # Unchanged map contents skip the YAML parse entirely
+    knowledge_map = load_cached_map(data)
+    if knowledge_map is None:
+        knowledge_map = yaml.load(data, Loader=_YamlLoader)
+        store_cached_map(data, knowledge_map)
 
-    with open(map_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+    return knowledge_map, data
@@ -1,12 +1,25 @@
 """Document caching system with LRU eviction policy"""
 
-from collections import OrderedDict
-from pathlib import Path
 from typing import Optional, Dict, Any
-import hashlib
+import os
+import sys
+import threading
 import time
 
 
+class _Entry:
+    """Cached document content with its bookkeeping fields"""
+
+    __slots__ = ('content', 'size', 'mtime', 'cached_at', 'path')
+
+    def __init__(self, content: str, size: int, mtime: float, cached_at: float, path: str):
+        self.content = content
+        self.size = size
+        self.mtime = mtime
+        self.cached_at = cached_at
+        self.path = path
+
+
 class DocumentCache:
     """LRU cache for document content to avoid redundant file reads.
 
@@ -27,9 +40,11 @@ class DocumentCache:
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.max_items = max_items
         self.current_size = 0
-        self.cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # Plain dicts keep insertion order: oldest entry first, re-inserted on use
+        self.cache: Dict[str, _Entry] = {}
         self.hits = 0
         self.misses = 0
+        self._lock = threading.RLock()
 
     def _get_cache_key(self, file_path: str) -> str:
         """Generate cache key from file path.
@@ -38,10 +53,9 @@ class DocumentCache:
             file_path: Path to the document
 
         Returns:
-            Cache key (MD5 hash of absolute path)
+            Cache key (absolute path; string-only, no filesystem access)
         """
-        abs_path = str(Path(file_path).resolve())
-        return hashlib.md5(abs_path.encode()).hexdigest()
+        return os.path.abspath(file_path)
 
     def _get_file_mtime(self, file_path: str) -> float:
         """Get file modification time.
@@ -53,70 +67,107 @@ class DocumentCache:
             Modification timestamp
         """
         try:
-            return Path(file_path).stat().st_mtime
-        except:
+            return os.stat(file_path).st_mtime
+        except OSError:
             return 0.0
 
-    def get(self, file_path: str) -> Optional[str]:
+    def get(self, file_path: str, mtime: Optional[float] = None) -> Optional[str]:
         """Retrieve document content from cache.
 
         Args:
             file_path: Path to the document
+            mtime: Modification time if the caller already stat'ed the file;
+                pass the same value to put() on a miss so the file is stat'ed once
 
         Returns:
             Cached content if available and valid, None otherwise
         """
         cache_key = self._get_cache_key(file_path)
 
-        # Check if in cache
-        if cache_key not in self.cache:
-            self.misses += 1
-            return None
+        # Check if in cache (one lookup for both the test and the entry)
+        with self._lock:
+            cached_entry = self.cache.get(cache_key)
+            if cached_entry is None:
+                self.misses += 1
+                return None
 
-        # Check if file has been modified
-        current_mtime = self._get_file_mtime(file_path)
-        cached_entry = self.cache[cache_key]
+        # Check if file has been modified (stat outside the lock)
+        current_mtime = self._get_file_mtime(file_path) if mtime is None else mtime
 
-        if current_mtime > cached_entry['mtime']:
-            # File modified, invalidate cache
-            self._remove_entry(cache_key)
-            self.misses += 1
-            return None
+        with self._lock:
+            if self.cache.get(cache_key) is not cached_entry:
+                # Replaced or evicted by another thread meanwhile
+                self.misses += 1
+                return None
+
+            if current_mtime > cached_entry.mtime:
+                # File modified, invalidate cache
+                self._remove_entry(cache_key)
+                self.misses += 1
+                return None
 
-        # Move to end (most recently used)
-        self.cache.move_to_end(cache_key)
-        self.hits += 1
+            # Move to end (most recently used)
+            del self.cache[cache_key]
+            self.cache[cache_key] = cached_entry
+            self.hits += 1
 
-        return cached_entry['content']
+        return cached_entry.content
 
-    def put(self, file_path: str, content: str):
+    def put(self, file_path: str, content: str, mtime: Optional[float] = None):
         """Store document content in cache.
 
         Args:
             file_path: Path to the document
             content: Document content to cache
+            mtime: Modification time if already known (avoids another stat)
         """
         cache_key = self._get_cache_key(file_path)
-        content_size = len(content.encode('utf-8'))
+        # In-memory size of the str, O(1) instead of re-encoding the whole text
+        content_size = sys.getsizeof(content)
 
-        # Remove existing entry if present
-        if cache_key in self.cache:
+        if mtime is None:
+            mtime = self._get_file_mtime(file_path)
+
+        with self._lock:
+            # Remove existing entry if present
             self._remove_entry(cache_key)
 
-        # Evict entries if necessary
-        while (self.current_size + content_size > self.max_size_bytes or
-               len(self.cache) >= self.max_items) and self.cache:
-            self._evict_oldest()
-
-        # Add new entry
-        self.cache[cache_key] = {
-            'content': content,
-            'size': content_size,
-            'mtime': self._get_file_mtime(file_path),
-            'cached_at': time.time(),
-            'path': file_path
-        }
-        self.current_size += content_size
+            # Evict entries if necessary
+            while (self.current_size + content_size > self.max_size_bytes or
+                   len(self.cache) >= self.max_items) and self.cache:
+                self._evict_oldest()
+
+            # Add new entry
+            self.cache[cache_key] = _Entry(content, content_size, mtime, time.time(), file_path)
+            self.current_size += content_size
+
+    def put_file(self, file_path: str) -> str:
+        """Read a text file straight into the cache.
+
+        The file is read with readinto() into a bytearray sized from fstat, so
+        large documents are not grown chunk by chunk; the same fstat supplies
+        the mtime.
+
+        Args:
+            file_path: Path to the document
+
+        Returns:
+            Decoded document content (also stored in the cache)
+        """
+        with open(file_path, 'rb', buffering=0) as f:
+            st = os.fstat(f.fileno())
+            view = memoryview(bytearray(st.st_size))
+            n = 0
+            while n < st.st_size:
+                read = f.readinto(view[n:])
+                if not read:
+                    break
+                n += read
+
+        # Decode straight from the buffer, no intermediate bytes copy
+        content = str(view[:n], 'utf-8', 'replace')
+        self.put(file_path, content, mtime=st.st_mtime)
+        return content
 
     def _remove_entry(self, cache_key: str):
         """Remove entry from cache.
@@ -124,22 +175,25 @@ class DocumentCache:
         Args:
             cache_key: Key of entry to remove
         """
-        if cache_key in self.cache:
-            entry = self.cache.pop(cache_key)
-            self.current_size -= entry['size']
+        with self._lock:
+            entry = self.cache.pop(cache_key, None)
+            if entry is not None:
+                self.current_size -= entry.size
 
     def _evict_oldest(self):
         """Evict the least recently used entry."""
-        if self.cache:
-            oldest_key = next(iter(self.cache))
-            self._remove_entry(oldest_key)
+        with self._lock:
+            if self.cache:
+                oldest_key = next(iter(self.cache))
+                self._remove_entry(oldest_key)
 
     def clear(self):
         """Clear all cached entries."""
-        self.cache.clear()
-        self.current_size = 0
-        self.hits = 0
-        self.misses = 0
+        with self._lock:
+            self.cache.clear()
+            self.current_size = 0
+            self.hits = 0
+            self.misses = 0
 
     def invalidate(self, file_path: str):
         """Invalidate cached entry for a specific file.
@@ -156,33 +210,40 @@ class DocumentCache:
         Returns:
             Dictionary with cache statistics
         """
-        hit_rate = self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 0
-
-        return {
-            'size_mb': self.current_size / (1024 * 1024),
-            'max_size_mb': self.max_size_bytes / (1024 * 1024),
-            'items': len(self.cache),
-            'max_items': self.max_items,
-            'hits': self.hits,
-            'misses': self.misses,
-            'hit_rate': f"{hit_rate:.2%}",
-            'cached_files': [entry['path'] for entry in self.cache.values()]
-        }
-
-
-# Global cache instance
+        with self._lock:
+            hit_rate = self.hits / (self.hits + self.misses) if (self.hits + self.misses) > 0 else 0
+
+            return {
+                'size_mb': self.current_size / (1024 * 1024),
+                'max_size_mb': self.max_size_bytes / (1024 * 1024),
+                'items': len(self.cache),
+                'max_items': self.max_items,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': f"{hit_rate:.2%}",
+                'cached_files': [entry.path for entry in self.cache.values()]
+            }
+
+
+# Global cache instance and the PID that created it
 _global_cache: Optional[DocumentCache] = None
+_global_cache_pid: Optional[int] = None
 
 
 def get_cache() -> DocumentCache:
     """Get or create global document cache instance.
 
+    A forked child gets a fresh cache instead of the parent's copy, whose
+    entries (and lock state) belong to the parent process.
+
     Returns:
         Global DocumentCache instance
     """
-    global _global_cache
-    if _global_cache is None:
+    global _global_cache, _global_cache_pid
+    pid = os.getpid()
+    if _global_cache is None or _global_cache_pid != pid:
         _global_cache = DocumentCache()
+        _global_cache_pid = pid
     return _global_cache
 
 
@@ -1,13 +1,24 @@
 """Configuration management utilities"""
 
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+# libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
 
+
+@lru_cache(maxsize=8)
 def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     """Load configuration from YAML file.
 
+    Parsed once per path per process; treat the result as read-only and call
+    load_config.cache_clear() after changing the file.
+
     Args:
         config_path: Path to config file (default: config.yaml in current dir)
 
@@ -24,7 +35,7 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     for path in search_paths:
         if path.exists():
             with open(path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+                return yaml.load(f, Loader=_YamlLoader)
 
     # Return default config if not found
     return get_default_config()
@@ -65,9 +76,13 @@ def get_default_config() -> Dict[str, Any]:
     }
 
 
+@lru_cache(maxsize=1)
 def get_default_model() -> str:
     """Get default model from config.
 
+    Read once per process; call get_default_model.cache_clear() and
+    load_config.cache_clear() after changing config.yaml.
+
     Returns:
         Default model name
     """
@@ -1,15 +1,38 @@
 """File locking mechanism to prevent concurrent modifications"""
 
 import os
+import random
 import time
 from pathlib import Path
 from typing import Optional
 import errno
 
-# Platform-specific imports
-if os.name != 'nt':
+# Retry backoff while the lock is contended (seconds)
+_RETRY_DELAY_MIN = 0.001
+_RETRY_DELAY_MAX = 0.05
+
+# Platform-specific lock primitives, resolved once at import
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock(fd: int):
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+    def _unlock(fd: int):
+        try:
+            # On Windows, unlocking may fail if already unlocked
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass  # Already unlocked, ignore
+else:
     import fcntl
 
+    def _lock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock(fd: int):
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
 
 class FileLock:
     """Cross-platform file lock for preventing concurrent access.
@@ -42,6 +65,7 @@ class FileLock:
         self.lock_file.parent.mkdir(parents=True, exist_ok=True)
 
         start_time = time.time()
+        delay = _RETRY_DELAY_MIN
 
         while True:
             try:
@@ -52,17 +76,11 @@ class FileLock:
                 )
 
                 # Try to acquire exclusive lock
-                if os.name == 'nt':
-                    # Windows
-                    import msvcrt
-                    msvcrt.locking(self.lock_file_fd, msvcrt.LK_NBLCK, 1)
-                else:
-                    # Unix/Linux
-                    fcntl.flock(self.lock_file_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
-
-                # Write PID to lock file
+                _lock(self.lock_file_fd)
+
+                # Write PID to lock file (no fsync: readers see it through the page
+                # cache, and the kernel lock - not the file contents - is what excludes)
                 os.write(self.lock_file_fd, str(os.getpid()).encode())
-                os.fsync(self.lock_file_fd)
 
                 self.is_locked = True
                 return True
@@ -83,8 +101,10 @@ class FileLock:
                 if time.time() - start_time >= self.timeout:
                     return False
 
-                # Wait before retry
-                time.sleep(0.1)
+                # Wait before retry: exponential backoff with jitter so short
+                # critical sections are picked up quickly without busy-polling
+                time.sleep(delay + random.random() * delay)
+                delay = min(delay * 2, _RETRY_DELAY_MAX)
 
     def release(self):
         """Release the lock."""
@@ -94,15 +114,7 @@ class FileLock:
         try:
             if self.lock_file_fd is not None:
                 # Release the lock
-                if os.name == 'nt':
-                    import msvcrt
-                    try:
-                        # On Windows, unlocking may fail if already unlocked
-                        msvcrt.locking(self.lock_file_fd, msvcrt.LK_UNLCK, 1)
-                    except (OSError, IOError):
-                        pass  # Already unlocked, ignore
-                else:
-                    fcntl.flock(self.lock_file_fd, fcntl.LOCK_UN)
+                _unlock(self.lock_file_fd)
 
                 # Close the file descriptor
                 try:
@@ -195,14 +207,8 @@ class KnowledgeMapLock:
 
             # Check if process is still running
             if os.name == 'nt':
-                # Windows - check if process exists
-                import subprocess
-                result = subprocess.run(
-                    ['tasklist', '/FI', f'PID eq {lock_pid}'],
-                    capture_output=True,
-                    text=True
-                )
-                return str(lock_pid) in result.stdout
+                # Windows - ask the kernel directly instead of spawning tasklist
+                return _windows_process_alive(lock_pid)
             else:
                 # Unix/Linux - send signal 0 to check if process exists
                 try:
@@ -224,6 +230,37 @@ class KnowledgeMapLock:
         return self.lock.__exit__(exc_type, exc_val, exc_tb)
 
 
+def _windows_process_alive(pid: int) -> bool:
+    """Check whether a process is running on Windows via OpenProcess.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        True if the process exists and has not exited
+    """
+    import ctypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    STILL_ACTIVE = 259
+    ERROR_ACCESS_DENIED = 5
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied means the process exists but belongs to someone else
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+
+    try:
+        # Exited processes stay openable while handles remain; check the exit code
+        exit_code = ctypes.c_ulong()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
 def check_knowledge_map_lock(directory: str = ".") -> Optional[str]:
     """Check if knowledge map is locked and return warning message.
 
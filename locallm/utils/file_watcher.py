@@ -3,7 +3,7 @@
 import os
 import time
 from pathlib import Path
-from typing import Dict, Set
+from typing import Dict, Iterator, Set, Tuple
 import yaml
 
 
@@ -21,21 +21,60 @@ class DocumentWatcher:
         self._last_snapshot = self._take_snapshot()
         self._last_check_time = time.time()
 
+    def _iter_documents(self) -> Iterator[Tuple[str, float]]:
+        """Yield every watched document with its modification time.
+
+        Yields:
+            (file path, modification time) pairs
+        """
+        # Walk with os.scandir: entry types come from the directory listing, so
+        # each document costs one stat; symlinked directories are not followed
+        stack = [str(self.directory)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif os.path.splitext(entry.name)[1].lower() in self.supported_exts and entry.is_file():
+                                yield entry.path, entry.stat().st_mtime
+                        except OSError:
+                            # Skip files we can't access
+                            pass
+            except OSError:
+                # Skip directories we can't read
+                pass
+
     def _take_snapshot(self) -> Dict[str, float]:
         """Take a snapshot of all documents and their modification times.
 
         Returns:
             Dictionary mapping file paths to modification times
         """
-        snapshot = {}
-        for file_path in self.directory.rglob('*'):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_exts:
-                try:
-                    snapshot[str(file_path)] = file_path.stat().st_mtime
-                except OSError:
-                    # Skip files we can't access
-                    pass
-        return snapshot
+        return dict(self._iter_documents())
+
+    def _any_change(self) -> bool:
+        """Check against the last snapshot without building a new one.
+
+        Stops at the first new or modified document and leaves the snapshot
+        untouched, so a following check_for_changes() still reports it.
+
+        Returns:
+            True if any document was added, modified or deleted
+        """
+        seen = 0
+        for path, mtime in self._iter_documents():
+            if self._last_snapshot.get(path) != mtime:
+                return True
+            seen += 1
+        # Every current document is known, so a lower count means deletions
+        return seen != len(self._last_snapshot)
+
+    def refresh(self):
+        """Reset the baseline snapshot to the current state of the directory."""
+        self._last_snapshot = self._take_snapshot()
+        self._last_check_time = time.time()
 
     def check_for_changes(self) -> Dict[str, Set[str]]:
         """Check if any documents have changed since last check.
@@ -45,14 +84,15 @@ class DocumentWatcher:
         """
         current_snapshot = self._take_snapshot()
 
-        # Find changes
-        added = set(current_snapshot.keys()) - set(self._last_snapshot.keys())
-        deleted = set(self._last_snapshot.keys()) - set(current_snapshot.keys())
-        modified = set()
+        last_snapshot = self._last_snapshot
 
-        for path in set(current_snapshot.keys()) & set(self._last_snapshot.keys()):
-            if current_snapshot[path] != self._last_snapshot[path]:
-                modified.add(path)
+        # Find changes (keys views support set operations and return sets)
+        added = current_snapshot.keys() - last_snapshot.keys()
+        deleted = last_snapshot.keys() - current_snapshot.keys()
+        modified = {
+            path for path in current_snapshot.keys() & last_snapshot.keys()
+            if current_snapshot[path] != last_snapshot[path]
+        }
 
         # Update snapshot
         self._last_snapshot = current_snapshot
@@ -70,8 +110,8 @@ class DocumentWatcher:
         Returns:
             True if any documents have changed
         """
-        changes = self.check_for_changes()
-        return bool(changes['added'] or changes['modified'] or changes['deleted'])
+        self._last_check_time = time.time()
+        return self._any_change()
 
     def get_change_summary(self) -> str:
         """Get a human-readable summary of changes.
@@ -1,7 +1,18 @@
 """Language detection and multilingual support"""
 
 import re
-from typing import Tuple
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# Script ranges used for language detection
+_CHINESE_RE = re.compile(r'[\u4e00-\u9fff]')
+_JAPANESE_RE = re.compile(r'[\u3040-\u309f\u30a0-\u30ff]')
+_KOREAN_RE = re.compile(r'[\uac00-\ud7af]')
+
+
+# Texts up to this length are memoized; longer ones are scanned uncached so the
+# cache never pins whole documents in memory
+_CACHE_MAX_TEXT_LEN = 256
 
 
 def detect_language(text: str) -> str:
@@ -13,28 +24,25 @@ def detect_language(text: str) -> str:
     Returns:
         Language code: 'zh' (Chinese), 'en' (English), 'ja' (Japanese), etc.
     """
-    # Count characters from different scripts
-    chinese_chars = len(re.findall(r'[\u4e00-\u9fff]', text))
-    japanese_chars = len(re.findall(r'[\u3040-\u309f\u30a0-\u30ff]', text))
-    korean_chars = len(re.findall(r'[\uac00-\ud7af]', text))
+    if len(text) <= _CACHE_MAX_TEXT_LEN:
+        return _detect_language_cached(text)
+    return _detect_language(text)
 
-    total_chars = len(text.strip())
 
-    if total_chars == 0:
-        return 'en'
+@lru_cache(maxsize=1024)
+def _detect_language_cached(text: str) -> str:
+    return _detect_language(text)
 
-    # Calculate percentages
-    chinese_pct = chinese_chars / total_chars
-    japanese_pct = japanese_chars / total_chars
-    korean_pct = korean_chars / total_chars
 
-    # Detect based on character distribution
-    # Lower threshold to 10% or at least 1 Chinese character for better detection of short queries
-    if chinese_chars > 0 and (chinese_pct > 0.1 or chinese_chars >= 1):
+def _detect_language(text: str) -> str:
+    # Any character of a script decides (the old 10% threshold was always met by
+    # "at least 1 character"), checked in priority order: Chinese, Japanese, Korean.
+    # search() stops at the first hit instead of counting every character.
+    if _CHINESE_RE.search(text):
         return 'zh'
-    elif japanese_chars > 0 and (japanese_pct > 0.1 or japanese_chars >= 1):
+    elif _JAPANESE_RE.search(text):
         return 'ja'
-    elif korean_chars > 0 and (korean_pct > 0.1 or korean_chars >= 1):
+    elif _KOREAN_RE.search(text):
         return 'ko'
     else:
         return 'en'
@@ -63,7 +71,7 @@ def get_language_instruction(lang: str) -> str:
     return instructions.get(lang, instructions['en'])
 
 
-def get_ui_strings(lang: str) -> dict:
+def get_ui_strings(lang: str) -> Dict[str, str]:
     """Get UI strings for a specific language.
 
     Args:
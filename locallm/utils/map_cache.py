@@ -0,0 +1,103 @@
+"""Content-addressed cache of parsed knowledge maps"""
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+# Cached maps kept on disk; older ones are pruned when a new map is stored
+MAX_CACHED_MAPS = 8
+
+
+def _cache_dir() -> Path:
+    """Get the directory holding cached maps (~/.cache/locallm by default)"""
+    base = os.environ.get('XDG_CACHE_HOME') or (Path.home() / '.cache')
+    return Path(base) / 'locallm'
+
+
+def _cache_path(data: bytes) -> Path:
+    """Get the cache file for the given map file contents.
+
+    Args:
+        data: Raw bytes of the knowledge map file
+
+    Returns:
+        Path of the pickle named after the content hash
+    """
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return _cache_dir() / f"map-{digest}.pkl"
+
+
+def load_cached_map(data: bytes) -> Optional[Dict[str, Any]]:
+    """Load a previously parsed map for identical file contents.
+
+    Args:
+        data: Raw bytes of the knowledge map file
+
+    Returns:
+        Parsed knowledge map, or None on cache miss
+    """
+    path = _cache_path(data)
+    try:
+        with open(path, 'rb') as f:
+            knowledge_map = pickle.load(f)
+    except Exception:
+        # Missing or unreadable cache entry - caller parses the YAML instead
+        return None
+
+    try:
+        # Mark as recently used so pruning keeps maps that are still loaded
+        os.utime(path)
+    except OSError:
+        pass
+    return knowledge_map
+
+
+def store_cached_map(data: bytes, knowledge_map: Dict[str, Any]):
+    """Store a parsed map keyed by the hash of its file contents.
+
+    Args:
+        data: Raw bytes of the knowledge map file
+        knowledge_map: Parsed knowledge map
+    """
+    path = _cache_path(data)
+    tmp_path = path.with_name(path.name + f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(knowledge_map, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError:
+        # Caching is best effort
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        return
+
+    _prune_cache(path.parent)
+
+
+def _prune_cache(cache_dir: Path):
+    """Delete all but the MAX_CACHED_MAPS most recently used cached maps.
+
+    Every rebuild changes the map bytes and so adds a new entry; without
+    pruning the cache directory would grow forever.
+
+    Args:
+        cache_dir: Directory holding cached maps
+    """
+    entries = []
+    for path in cache_dir.glob('map-*.pkl'):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue  # Removed by another process meanwhile
+
+    entries.sort(reverse=True)
+    for _, path in entries[MAX_CACHED_MAPS:]:
+        try:
+            path.unlink()
+        except OSError:
+            pass
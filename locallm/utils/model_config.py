@@ -1,5 +1,7 @@
 """Model-specific configurations for context window and parameters"""
 
+import sys
+from functools import lru_cache
 from typing import Dict, Any
 
 
@@ -46,7 +48,28 @@ MODEL_CONTEXT_WINDOWS = {
 # Default context window for unknown models
 DEFAULT_CONTEXT_WINDOW = 8192
 
+# Sampling overrides per model family, merged over the defaults in get_model_config
+_FAMILY_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    # Qwen models work well with slightly higher temperature
+    'qwen': {'temperature': 0.35, 'top_p': 0.8},
+    # Llama models benefit from lower temperature for accuracy
+    'llama': {'temperature': 0.2, 'top_p': 0.9},
+    # DeepSeek models are optimized for reasoning
+    'deepseek': {'temperature': 0.1, 'top_p': 0.95},
+}
+
+# Prefix candidates, longest first so the most specific family wins
+# (e.g. 'mistral-nemo-12b' matches 'mistral-nemo', not 'mistral')
+_MODEL_PREFIX_INDEX = sorted(MODEL_CONTEXT_WINDOWS.items(), key=lambda item: -len(item[0]))
+
+
+@lru_cache(maxsize=64)
+def _base_model(model_name: str) -> str:
+    """Strip the tag and lowercase a model name (e.g. 'Qwen3:latest' -> 'qwen3')"""
+    return sys.intern(model_name.split(':', 1)[0].lower())
 
+
+@lru_cache(maxsize=64)
 def get_model_context_window(model_name: str) -> int:
     """Get context window size for a given model.
 
@@ -57,21 +80,31 @@ def get_model_context_window(model_name: str) -> int:
         Context window size in tokens
     """
     # Remove version suffix if present (e.g., 'qwen3:latest' -> 'qwen3')
-    base_model = model_name.split(':')[0].lower()
+    base_model = _base_model(model_name)
 
     # Try exact match first
     if base_model in MODEL_CONTEXT_WINDOWS:
         return MODEL_CONTEXT_WINDOWS[base_model]
 
     # Try prefix match (e.g., 'qwen3-32k' matches 'qwen3')
-    for key in MODEL_CONTEXT_WINDOWS:
-        if base_model.startswith(key):
-            return MODEL_CONTEXT_WINDOWS[key]
+    for prefix, context_window in _MODEL_PREFIX_INDEX:
+        if base_model.startswith(prefix):
+            return context_window
 
     # Return default
     return DEFAULT_CONTEXT_WINDOW
 
 
+@lru_cache(maxsize=64)
+def _family_of(base_model: str) -> str:
+    """Get the _FAMILY_DEFAULTS key for a base model name ('' if none)"""
+    for family in _FAMILY_DEFAULTS:
+        if base_model.startswith(family):
+            return family
+    return ''
+
+
+@lru_cache(maxsize=64)
 def get_optimal_context_for_task(model_name: str, task_type: str = 'qa') -> int:
     """Get optimal context window for a specific task.
 
@@ -121,22 +154,8 @@ def get_model_config(model_name: str, task_type: str = 'qa') -> Dict[str, Any]:
     }
 
     # Model-specific optimizations
-    base_model = model_name.split(':')[0].lower()
-
-    if base_model.startswith('qwen'):
-        # Qwen models work well with slightly higher temperature
-        config['temperature'] = 0.35
-        config['top_p'] = 0.8
-
-    elif base_model.startswith('llama'):
-        # Llama models benefit from lower temperature for accuracy
-        config['temperature'] = 0.2
-        config['top_p'] = 0.9
-
-    elif base_model.startswith('deepseek'):
-        # DeepSeek models are optimized for reasoning
-        config['temperature'] = 0.1
-        config['top_p'] = 0.95
+    base_model = _base_model(model_name)
+    config.update(_FAMILY_DEFAULTS.get(_family_of(base_model), ()))
 
     return config
 
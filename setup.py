@@ -1,14 +1,28 @@
+import os
+
 from setuptools import setup, find_packages
 
+# Optional: set LOCALLM_MYPYC=1 to compile the prompt builder into a C extension
+# (requires mypy, e.g. `pip install mypy`); the pure-Python module is used otherwise
+ext_modules = []
+if os.environ.get('LOCALLM_MYPYC'):
+    from mypyc.build import mypycify
+    ext_modules = mypycify(['locallm/agents/prompts.py'])
+
 setup(
     name='locallm',
     version='0.8.0',
     packages=find_packages(),
+    package_data={'locallm': ['py.typed']},
+    ext_modules=ext_modules,
     install_requires=[
         'rich>=13.0.0',
         'click>=8.0.0',
         'colorama>=0.4.6',
     ],
+    extras_require={
+        'fast': ['orjson>=3.0.0'],
+    },
     entry_points={
         'console_scripts': [
             'locallm=locallm.cli:main',
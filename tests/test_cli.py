@@ -0,0 +1,67 @@
+"""Tests for CLI helpers"""
+
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest import mock
+
+from locallm import cli
+
+
+class RgSearchTest(unittest.TestCase):
+    """/search hands plain-text files to ripgrep when it is installed"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def fake_run(self, returncode=0, stdout="notes.md\n1:needle\n"):
+        return mock.patch.object(cli.subprocess, 'run', return_value=subprocess.CompletedProcess(
+            args=[], returncode=returncode, stdout=stdout, stderr=""))
+
+    def test_searches_hidden_and_ignored_files(self):
+        with mock.patch.object(cli, '_RG', '/usr/bin/rg'), self.fake_run() as run:
+            output = cli._rg_search('needle', self.root)
+
+        self.assertEqual(output, "notes.md\n1:needle\n")
+        cmd = run.call_args.args[0]
+        self.assertEqual(cmd[0], '/usr/bin/rg')
+        for flag in ('--hidden', '--no-ignore', '--no-messages', '--ignore-case'):
+            self.assertIn(flag, cmd)
+        for ext in sorted(cli.TEXT_EXTS):
+            self.assertIn(f'*{ext}', cmd)
+        self.assertEqual(cmd[-3:], ['--', 'needle', self.root])
+
+    def test_no_match_or_error_returns_empty(self):
+        for returncode in (1, 2):
+            with mock.patch.object(cli, '_RG', '/usr/bin/rg'), self.fake_run(returncode, stdout="partial"):
+                self.assertEqual(cli._rg_search('needle', self.root), "")
+
+        with mock.patch.object(cli, '_RG', '/usr/bin/rg'), \
+                mock.patch.object(cli.subprocess, 'run', side_effect=subprocess.TimeoutExpired('rg', 30)):
+            self.assertEqual(cli._rg_search('needle', self.root), "")
+
+    def test_rg_hit_leaves_only_pdf_and_docx_to_python(self):
+        console = mock.Mock()
+        with mock.patch.object(cli, '_RG', '/usr/bin/rg'), self.fake_run(), \
+                mock.patch.object(cli, '_grep_documents', return_value=iter(())) as grep_documents, \
+                mock.patch.object(cli.os, 'getcwd', return_value=self.root):
+            cli._cmd_search('needle', None, console)
+
+        self.assertEqual(grep_documents.call_args.args[2], cli.SUPPORTED_EXTS - cli.TEXT_EXTS)
+
+    def test_without_rg_python_searches_every_document_type(self):
+        with open(os.path.join(self.root, '.hidden.md'), 'w', encoding='utf-8') as f:
+            f.write("needle\n")
+        console = mock.Mock()
+        with mock.patch.object(cli, '_RG', None), mock.patch.object(cli.os, 'getcwd', return_value=self.root):
+            cli._cmd_search('needle', None, console)
+
+        printed = [call.args[0] for call in console.print.call_args_list if call.args]
+        self.assertTrue(any('.hidden.md' in str(text) for text in printed))
+
+
+if __name__ == '__main__':
+    unittest.main()
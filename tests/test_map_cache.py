@@ -0,0 +1,49 @@
+"""Tests for the parsed knowledge map cache"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from locallm.utils import map_cache
+
+
+class MapCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': tmp.name})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def age(self, data: bytes, seconds: int):
+        """Backdate a cached map's mtime"""
+        path = map_cache._cache_path(data)
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime - seconds))
+
+    def test_round_trip(self):
+        map_cache.store_cached_map(b"map", {'documents': []})
+        self.assertEqual(map_cache.load_cached_map(b"map"), {'documents': []})
+        self.assertIsNone(map_cache.load_cached_map(b"other"))
+
+    def test_store_prunes_least_recently_used(self):
+        total = map_cache.MAX_CACHED_MAPS + 3
+        for i in range(total):
+            map_cache.store_cached_map(b"map%d" % i, {'i': i})
+            self.age(b"map%d" % i, total - i)
+
+        # Loading refreshes an old entry so the next prune keeps it
+        self.assertEqual(map_cache.load_cached_map(b"map3"), {'i': 3})
+        map_cache.store_cached_map(b"new", {})
+
+        cached = list(map_cache._cache_dir().glob('map-*.pkl'))
+        self.assertEqual(len(cached), map_cache.MAX_CACHED_MAPS)
+        self.assertIsNotNone(map_cache.load_cached_map(b"map3"))
+        self.assertIsNotNone(map_cache.load_cached_map(b"new"))
+        self.assertIsNone(map_cache.load_cached_map(b"map4"))
+
+
+if __name__ == '__main__':
+    unittest.main()
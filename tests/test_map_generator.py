@@ -0,0 +1,65 @@
+"""Tests for knowledge map generation"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+from locallm.tools import map_generator
+
+_REPLY = json.dumps({
+    'description': "Notes about the local knowledge base, covering how documents are "
+                   "scanned, summarized and listed in the generated knowledge map.",
+    'key_concepts': ['knowledge base', 'document map'],
+})
+
+
+class AnalysisMemoTest(unittest.TestCase):
+    """Rebuilds reuse AI analyses from the previous map and the memo"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.directory = Path(tmp.name)
+        self.doc = self.directory / 'notes.md'
+        self.doc.write_text("# Notes\n\nThe knowledge base keeps a map of documents.\n", encoding='utf-8')
+
+        patcher = mock.patch.object(map_generator._client, 'generate', return_value={'response': _REPLY})
+        self.generate = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def build(self):
+        """Run a full-mode build; return (AI calls made, memo entries saved)"""
+        self.generate.reset_mock()
+        with mock.patch('rich.console.Console.print'):
+            map_generator.generate_knowledge_map(self.directory, fast_mode=False)
+        memo = json.loads((self.directory / '.knowledge_map_cache.json').read_text(encoding='utf-8'))
+        return self.generate.call_count, len(memo)
+
+    def test_touched_file_reuses_memo_after_unchanged_rebuild(self):
+        self.assertEqual(self.build(), (1, 1))
+        # Nothing changed: the entry is reused from the map and the memo is kept
+        self.assertEqual(self.build(), (0, 1))
+
+        # Same content, new mtime: answered from the memo instead of the AI
+        stat = self.doc.stat()
+        os.utime(self.doc, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(self.build(), (0, 1))
+
+    def test_fallback_entry_is_analyzed_again(self):
+        # Ollama down: the entry gets a fallback description, which is not memoized
+        self.generate.side_effect = ConnectionError("Ollama is not running")
+        self.assertEqual(self.build(), (1, 0))
+
+        self.generate.side_effect = None
+        self.assertEqual(self.build(), (1, 1))
+        knowledge_map = yaml.safe_load((self.directory / 'knowledge_map.yaml').read_text(encoding='utf-8'))
+        self.assertEqual(knowledge_map['documents'][0]['description'], json.loads(_REPLY)['description'])
+
+
+if __name__ == '__main__':
+    unittest.main()